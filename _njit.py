@@ -0,0 +1,26 @@
+"""
+Optional Numba support
+Re-exports numba.njit, prange and set_num_threads when numba is installed,
+otherwise plain-Python stand-ins so the JIT kernels still run (slower, same
+results).
+"""
+
+try:
+    from numba import njit, prange, set_num_threads
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports both @njit and @njit(...))"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+    prange = range
+
+    def set_num_threads(n):
+        """No-op stand-in for numba.set_num_threads"""
@@ -7,10 +7,21 @@ import MetaTrader5 as mt5
 import numpy as np
 import pandas as pd
 from datetime import datetime, time, timedelta
+from pathlib import Path
 import logging
 from typing import List, Dict, Tuple, Optional
 import argparse
 import json
+import sys
+import multiprocessing
+import tempfile
+
+from _njit import njit, prange, set_num_threads
+
+try:
+    import orjson  # Optional: C JSON serializer for the results summary
+except ImportError:
+    orjson = None
 
 # =============================================================================
 # CONFIGURATION - Match trading_bot.py settings
@@ -34,13 +45,44 @@ MORNING_ENTRY_CUTOFF = time(16, 29)
 AFTERNOON_ENTRY_START = time(16, 45)
 AFTERNOON_EXIT_TIME = time(23, 55)
 
-# Scaling Levels
-SCALE_LEVELS = [0.75, 0.50, 0.25]
+# Scaling Levels (typed arrays handed straight to the session kernel)
+SCALE_LEVELS = np.array([0.75, 0.50, 0.25])
+REVERSAL_SCALE_LEVELS = np.array([0.50])  # Only 50% level on reversal
+
+# Open-trade capacity (initial entry + 3 scales is the most a session holds)
+MAX_OPEN_TRADES = 8
+
+# Trade direction signs
+DIRECTION_NAMES = {1: "BUY", -1: "SELL"}
+
+# Integer codes used inside the kernel and the trade log (decoded back to strings for reporting)
+TRADE_TYPES = ("INITIAL", "SCALE", "REVERSAL")
+TYPE_INITIAL, TYPE_SCALE, TYPE_REVERSAL = 0, 1, 2
+EXIT_REASONS = ("TP", "REVERSAL", "TIME_EXIT", "SESSION_END")
+EXIT_TP, EXIT_REVERSAL, EXIT_TIME, EXIT_SESSION_END = 0, 1, 2, 3
+SESSION_TYPES = ("MORNING", "AFTERNOON")
+
+# Weekdays are carried as dayofweek codes (Monday = 0) and only named for reporting
+WEEKDAY_NAMES = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+                          'Saturday', 'Sunday'], dtype=object)
+SATURDAY = 5
 
 # Backtesting Settings
 TIMEFRAME = mt5.TIMEFRAME_M5
 INITIAL_BALANCE = 10000.0  # Starting balance for simulation
 
+# Fetched bars are cached here as Parquet (needs pyarrow); --no-cache to disable
+DATA_CACHE_DIR = "backtest_cache"
+CACHE_COLUMNS = ['time', 'open', 'high', 'low', 'close']
+
+# Trades / equity curve file formats (--format); feather and parquet need pyarrow
+OUTPUT_FORMATS = ('csv', 'feather', 'parquet')
+
+# Price dtype for the simulation. np.float32 halves the memory traffic of the
+# candle arrays, but rounds prices (~1e-4 at XAUUSD levels) and can flip exact
+# TP / scale touches, so the default stays float64.
+PRICE_DTYPE = np.float64
+
 # Logging
 # Change to logging.DEBUG to see detailed drawdown calculations
 logging.basicConfig(
@@ -48,6 +90,8 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+# numba logs its compiler passes at DEBUG - keep them out of the backtest log
+logging.getLogger('numba').setLevel(logging.WARNING)
 
 # =============================================================================
 # TRADE CLASS
@@ -55,10 +99,16 @@ logger = logging.getLogger(__name__)
 
 class Trade:
     """Represents a single trade"""
-    def __init__(self, direction: str, entry_price: float, entry_time: datetime,
+    __slots__ = ('direction', 'entry_price', 'entry_time', 'lot_size', 'tp_price', 'trade_type',
+                 'session', 'exit_price', 'exit_time', 'exit_reason', 'profit', 'pips')
+    
+    # Symbol point shared by every trade - set once by Backtester.set_symbol_info
+    point: float = 0.00001
+    
+    def __init__(self, direction: int, entry_price: float, entry_time: datetime,
                  lot_size: float, tp_price: float, trade_type: str = "INITIAL",
                  session: str = "MORNING"):
-        self.direction = direction
+        self.direction = direction  # +1 BUY, -1 SELL
         self.entry_price = entry_price
         self.entry_time = entry_time
         self.lot_size = lot_size
@@ -71,81 +121,516 @@ class Trade:
         self.profit: Optional[float] = None
         self.pips: Optional[float] = None
         
-    def close(self, exit_price: float, exit_time: datetime, exit_reason: str, point: float):
-        """Close the trade and calculate profit"""
-        self.exit_price = exit_price
-        self.exit_time = exit_time
-        self.exit_reason = exit_reason
-        
-        # Calculate pips
-        if self.direction == "BUY":
-            self.pips = (exit_price - self.entry_price) / point / 10
-        else:
-            self.pips = (self.entry_price - exit_price) / point / 10
+    @staticmethod
+    def pnl(direction, entry_price, exit_price, lot_size):
+        """Pips and profit for one trade, or for a batch when given NumPy arrays"""
+        # Calculate pips (direction sign flips the move for SELL trades)
+        pips = direction * (exit_price - entry_price) / Trade.point / 10
         
         # Calculate profit (simplified: 1 pip = $1 per 0.01 lot)
         # For standard lot (100,000 units), 1 pip = $10
         # For 0.01 lot, 1 pip = $0.10
-        pip_value = self.lot_size * 100  # $1 per 0.01 lot per pip
-        self.profit = self.pips * pip_value
-        
-    def to_dict(self) -> Dict:
-        """Convert trade to dictionary"""
-        return {
-            'direction': self.direction,
-            'entry_price': self.entry_price,
-            'entry_time': self.entry_time,
-            'exit_price': self.exit_price,
-            'exit_time': self.exit_time,
-            'lot_size': self.lot_size,
-            'tp_price': self.tp_price,
-            'trade_type': self.trade_type,
-            'session': self.session,
-            'exit_reason': self.exit_reason,
-            'profit': self.profit,
-            'pips': self.pips,
-            'duration': (self.exit_time - self.entry_time) if self.exit_time else None
-        }
+        pip_value = lot_size * 100  # $1 per 0.01 lot per pip
+        return pips, pips * pip_value
+    
+    def close(self, exit_price: float, exit_time: datetime, exit_reason: str):
+        """Close the trade and calculate profit"""
+        pips, profit = Trade.pnl(self.direction, self.entry_price, exit_price, self.lot_size)
+        self.settle(exit_price, exit_time, exit_reason, pips, profit)
+    
+    def settle(self, exit_price: float, exit_time: datetime, exit_reason: str,
+               pips: float, profit: float):
+        """Close the trade with pips/profit already computed (e.g. batched through Trade.pnl)"""
+        self.exit_price = exit_price
+        self.exit_time = exit_time
+        self.exit_reason = exit_reason
+        self.pips = pips
+        self.profit = profit
+
+# =============================================================================
+# TRADE LOG
+# =============================================================================
+
+class TradeLog:
+    """Closed trades stored column-wise in preallocated NumPy arrays"""
+    COLUMNS = ('direction', 'entry_price', 'entry_time', 'exit_price', 'exit_time', 'lot_size',
+               'tp_price', 'trade_type', 'session', 'exit_reason', 'profit', 'pips')
+    DTYPES = {'direction': np.int8, 'entry_price': np.float64, 'entry_time': 'datetime64[ns]',
+              'exit_price': np.float64, 'exit_time': 'datetime64[ns]', 'lot_size': np.float64,
+              'tp_price': np.float64, 'trade_type': np.int8, 'session': np.int8,
+              'exit_reason': np.int8, 'profit': np.float64, 'pips': np.float64}
+    # String fields are stored as int8 codes into these labels
+    LABELS = {'trade_type': TRADE_TYPES, 'session': SESSION_TYPES, 'exit_reason': EXIT_REASONS}
+    
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.columns: Dict[str, np.ndarray] = {name: np.empty(capacity, dtype=self.DTYPES[name])
+                                               for name in self.COLUMNS}
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def reserve(self, capacity: int):
+        """Grow the column buffers to hold at least capacity trades"""
+        if capacity <= len(self.columns['profit']):
+            return
+        for name, values in self.columns.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:self.size] = values[:self.size]
+            self.columns[name] = grown
+    
+    def push(self, trade: Trade):
+        """Append a closed trade"""
+        if self.size == len(self.columns['profit']):
+            self.reserve(max(2 * self.size, 1024))
+        
+        row = self.size
+        for name, values in self.columns.items():
+            value = getattr(trade, name)
+            labels = self.LABELS.get(name)
+            values[row] = labels.index(value) if labels else value
+        self.size += 1
+    
+    def column(self, name: str) -> np.ndarray:
+        """View of one column over the closed trades"""
+        return self.columns[name][:self.size]
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """Build the trades DataFrame in one columnar pass"""
+        columns = {name: self.column(name) for name in self.COLUMNS}
+        columns['direction'] = np.array(("SELL", "BUY"), dtype=object)[(columns['direction'] > 0).astype(np.intp)]
+        for name, labels in self.LABELS.items():
+            columns[name] = np.array(labels, dtype=object)[columns[name]]
+        return pd.DataFrame(columns)
 
 # =============================================================================
 # SESSION STATE
 # =============================================================================
 
 class SessionState:
-    """Manages state for a single trading session"""
+    """Manages state for a single trading session (the candle loop runs in _simulate_session)"""
+    __slots__ = ('session_type', 'range_high', 'range_low', 'session_start_balance',
+                 'session_max_drawdown')
+    
     def __init__(self, session_type: str):
         self.session_type = session_type  # MORNING or AFTERNOON
         self.range_high: Optional[float] = None
         self.range_low: Optional[float] = None
-        self.breakout_direction: Optional[str] = None
-        self.breakout_price: Optional[float] = None
-        self.tp_price: Optional[float] = None
-        self.reversal_count: int = 0
-        self.scale_levels: List[float] = []
-        self.executed_scales: List[float] = []
-        self.open_trades: List[Trade] = []
         self.session_start_balance: float = 0.0
         self.session_max_drawdown: float = 0.0
-        self.session_peak_balance: float = 0.0
-        self.initial_breakout_done: bool = False  # Track if initial breakout already happened
-        self.breakout_candle_time: Optional[pd.Timestamp] = None  # Track when breakout candle closed
         
     def reset(self):
         """Reset session state"""
         self.range_high = None
         self.range_low = None
-        self.breakout_direction = None
-        self.breakout_price = None
-        self.tp_price = None
-        self.reversal_count = 0
-        self.scale_levels = []
-        self.executed_scales = []
-        self.open_trades = []
         self.session_start_balance = 0.0
         self.session_max_drawdown = 0.0
-        self.session_peak_balance = 0.0
-        self.breakout_candle_time = None
-        self.initial_breakout_done = False
+
+# =============================================================================
+# SESSION KERNEL
+# =============================================================================
+
+# Columns of the per-session trade table returned by _simulate_session.
+# Bar columns index into the day's candles, seq columns order opens/closes.
+(COL_ENTRY_BAR, COL_EXIT_BAR, COL_DIRECTION, COL_ENTRY_PRICE, COL_EXIT_PRICE,
+ COL_TP_PRICE, COL_LOT_SIZE, COL_TRADE_TYPE, COL_EXIT_REASON,
+ COL_ENTRY_SEQ, COL_EXIT_SEQ) = range(11)
+N_TRADE_COLS = 11
+
+# Trade table capacity (initial + 3 scales + reversal + 1 scale = 6 at most)
+MAX_SESSION_TRADES = 8
+
+# A session range needs at least this many candles
+MIN_RANGE_CANDLES = 3
+
+# Minute-of-day sentinel for "never" (no force close / no entry cutoff)
+END_OF_DAY = 24 * 60
+
+# Armed-level bound once every scale level is filled - finite, since the kernels
+# are compiled with fastmath, which assumes no infinities
+NO_ARMED_LEVEL = -1e300
+
+
+def _minute_of_day(t: time) -> int:
+    """Convert a datetime.time to minutes since midnight"""
+    return t.hour * 60 + t.minute
+
+
+@njit(cache=True)
+def _calculate_tp(breakout_price, direction, tp_distance):
+    """Calculate take profit price (the direction sign picks the side)"""
+    return breakout_price + direction * tp_distance
+
+
+@njit(cache=True)
+def _calculate_scale_levels(range_high, range_low, direction, percentages):
+    """Calculate scaling entry prices"""
+    range_size = range_high - range_low
+    if direction > 0:
+        return range_high - percentages * range_size
+    return range_low + percentages * range_size
+
+
+@njit(cache=True)
+def _armed_bound(levels, direction, executed_mask):
+    """
+    Highest direction * level over the levels not yet filled (NO_ARMED_LEVEL once all are).
+    
+    A candle can only fill a level if direction * touch_price is at or below
+    this, so one comparison rules out the whole level loop on quiet candles.
+    """
+    bound = NO_ARMED_LEVEL
+    for level_index in range(levels.shape[0]):
+        if not executed_mask & (1 << level_index):
+            bound = max(bound, direction * levels[level_index])
+    return bound
+
+
+@njit(cache=True)
+def _check_tp_hit(direction, tp_price, candle_high, candle_low):
+    """Check if take profit was hit (branchless - BUY tests the high, SELL the low)"""
+    return ((direction > 0) & (candle_high >= tp_price)) | ((direction < 0) & (candle_low <= tp_price))
+
+
+@njit(cache=True, fastmath=True)
+def _calculate_floating_pnl(n_open, open_direction, open_entry_price, open_lot_size,
+                            current_price, point):
+    """
+    Calculate floating profit/loss for open trades.
+    
+    Summed per trade rather than from running lot totals - those cancel, and a
+    session that never went underwater would report a -1e-13 drawdown.
+    """
+    floating_pnl = 0.0
+    for j in range(n_open):
+        pips = open_direction[j] * (current_price - open_entry_price[j]) / point / 10
+        floating_pnl += pips * (open_lot_size[j] * 100)
+    return floating_pnl
+
+
+@njit(cache=True)
+def _open_trade(trades, n_trades, seq, bar, direction, entry_price, tp_price,
+                lot_size, trade_type):
+    """Append a trade to the session table, returns its row"""
+    trades[n_trades, COL_ENTRY_BAR] = bar
+    trades[n_trades, COL_EXIT_BAR] = -1
+    trades[n_trades, COL_DIRECTION] = direction
+    trades[n_trades, COL_ENTRY_PRICE] = entry_price
+    trades[n_trades, COL_TP_PRICE] = tp_price
+    trades[n_trades, COL_LOT_SIZE] = lot_size
+    trades[n_trades, COL_TRADE_TYPE] = trade_type
+    trades[n_trades, COL_ENTRY_SEQ] = seq
+    return n_trades
+
+
+@njit(cache=True, fastmath=True)
+def _close_open_trades(trades, n_open, open_direction, open_entry_price, open_lot_size,
+                       open_row, exit_price, bar, exit_reason, seq, balance, point):
+    """Close every open trade, returns the updated (balance, seq)"""
+    for j in range(n_open):
+        row = open_row[j]
+        trades[row, COL_EXIT_BAR] = bar
+        trades[row, COL_EXIT_PRICE] = exit_price
+        trades[row, COL_EXIT_REASON] = exit_reason
+        trades[row, COL_EXIT_SEQ] = seq
+        seq += 1
+        pips = open_direction[j] * (exit_price - open_entry_price[j]) / point / 10
+        balance += pips * (open_lot_size[j] * 100)
+    return balance, seq
+
+
+@njit(cache=True, fastmath=True, inline='always')
+def _simulate_session(highs, lows, closes, minute_of_day, start, range_high, range_low,
+                      entry_cutoff, exit_time, close_at_end, balance, point, tp_units,
+                      lot_size, scale_levels, reversal_scale_levels):
+    """
+    Run one session's breakout state machine over the day's candles from start.
+    
+    Candles with minute_of_day > entry_cutoff may not open new trades; the first
+    candle at or after exit_time force closes everything and ends the session.
+    Returns (trades, max_drawdown) where trades is the session trade table (rows
+    with COL_EXIT_BAR == -1 were still open when the candles ran out).
+    """
+    trades = np.zeros((MAX_SESSION_TRADES, N_TRADE_COLS))
+    n_trades = 0
+    seq = 0
+    
+    # Open trades - they always share the session direction and tp_price
+    open_direction = np.zeros(MAX_OPEN_TRADES, dtype=np.int8)
+    open_entry_price = np.zeros(MAX_OPEN_TRADES)
+    open_lot_size = np.zeros(MAX_OPEN_TRADES)
+    open_row = np.zeros(MAX_OPEN_TRADES, dtype=np.int64)
+    n_open = 0
+    
+    tp_distance = tp_units * point
+    breakout_direction = 0  # +1 BUY, -1 SELL, 0 = not trading
+    tp_price = 0.0
+    reversal_count = 0
+    initial_breakout_done = False
+    breakout_bar = -1
+    
+    # Scale levels only depend on the range, so both directions are known up front
+    buy_levels = _calculate_scale_levels(range_high, range_low, 1, scale_levels)
+    sell_levels = _calculate_scale_levels(range_high, range_low, -1, scale_levels)
+    buy_reversal_levels = _calculate_scale_levels(range_high, range_low, 1, reversal_scale_levels)
+    sell_reversal_levels = _calculate_scale_levels(range_high, range_low, -1, reversal_scale_levels)
+    levels = buy_levels
+    executed_mask = 0  # bit i set once levels[i] has been filled
+    armed_bound = NO_ARMED_LEVEL  # _armed_bound of levels / executed_mask, kept in step with them
+    
+    peak_balance = balance
+    max_drawdown = 0.0
+    
+    n = closes.shape[0]
+    for i in range(start, n):
+        candle_high = highs[i]
+        candle_low = lows[i]
+        candle_close = closes[i]
+        
+        # Force close at exit time
+        if minute_of_day[i] >= exit_time:
+            if n_open:
+                balance, seq = _close_open_trades(trades, n_open, open_direction, open_entry_price,
+                                                  open_lot_size, open_row, candle_close, i,
+                                                  EXIT_TIME, seq, balance, point)
+                n_open = 0
+            break
+        
+        # Check if past entry cutoff for new trades
+        can_enter_new = minute_of_day[i] <= entry_cutoff
+        
+        # Check for initial breakout (only once per session!)
+        if not initial_breakout_done and can_enter_new:
+            direction = 0
+            if candle_close > range_high:
+                direction = 1
+            elif candle_close < range_low:
+                direction = -1
+            
+            if direction != 0:
+                breakout_direction = direction
+                tp_price = _calculate_tp(candle_close, direction, tp_distance)
+                levels = buy_levels if direction > 0 else sell_levels
+                armed_bound = _armed_bound(levels, direction, executed_mask)
+                initial_breakout_done = True
+                breakout_bar = i
+                
+                row = _open_trade(trades, n_trades, seq, i, direction, candle_close,
+                                  tp_price, lot_size, TYPE_INITIAL)
+                n_trades += 1
+                seq += 1
+                open_direction[n_open] = direction
+                open_entry_price[n_open] = candle_close
+                open_lot_size[n_open] = lot_size
+                open_row[n_open] = row
+                n_open += 1
+                # Skip rest of processing for this candle - start fresh on next candle
+                continue
+        
+        # Trading stopped for this session - nothing left can change
+        if initial_breakout_done and breakout_direction == 0:
+            break
+        
+        # Manage existing trades
+        if breakout_direction != 0:
+            # Check for TP hit - close all, but keep monitoring for remaining scale levels
+            if n_open and _check_tp_hit(breakout_direction, tp_price, candle_high, candle_low):
+                balance, seq = _close_open_trades(trades, n_open, open_direction, open_entry_price,
+                                                  open_lot_size, open_row, tp_price, i,
+                                                  EXIT_TP, seq, balance, point)
+                n_open = 0
+            
+            # Check for scaling FIRST (before reversal check), only after the breakout candle
+            touch_price = candle_low if breakout_direction > 0 else candle_high
+            if i > breakout_bar and breakout_direction * touch_price <= armed_bound:
+                for level_index in range(levels.shape[0]):
+                    if executed_mask & (1 << level_index):
+                        continue
+                    level = levels[level_index]
+                    
+                    # BUY levels trigger on the low, SELL levels on the high
+                    triggered = breakout_direction * (level - touch_price) >= 0
+                    
+                    # Past the entry window the level is skipped (but stays armed)
+                    if not triggered or not can_enter_new:
+                        continue
+                    
+                    if reversal_count >= 1:
+                        # For reversal: only 1 scale (50%) with 8x lot size
+                        scale_lot = lot_size * 8
+                    else:
+                        # For initial breakout: 75%=4x, 50%=3x, 25%=2x
+                        scale_lot = lot_size * (4 - level_index)
+                    
+                    row = _open_trade(trades, n_trades, seq, i, breakout_direction, level,
+                                      tp_price, scale_lot, TYPE_SCALE)
+                    n_trades += 1
+                    seq += 1
+                    open_direction[n_open] = breakout_direction
+                    open_entry_price[n_open] = level
+                    open_lot_size[n_open] = scale_lot
+                    open_row[n_open] = row
+                    n_open += 1
+                    # Mark every level at this price (a flat range collapses them into one)
+                    for e in range(levels.shape[0]):
+                        if levels[e] == level:
+                            executed_mask |= 1 << e
+                    armed_bound = _armed_bound(levels, breakout_direction, executed_mask)
+            
+            # Check for reversal AFTER scaling - a close beyond the opposite range bound
+            opposite_bound = range_low if breakout_direction > 0 else range_high
+            if breakout_direction * (candle_close - opposite_bound) < 0:
+                new_direction = -breakout_direction
+                if n_open:
+                    balance, seq = _close_open_trades(trades, n_open, open_direction, open_entry_price,
+                                                      open_lot_size, open_row, candle_close, i,
+                                                      EXIT_REVERSAL, seq, balance, point)
+                    n_open = 0
+
+                # Only ONE reversal per session with new positions, and only inside the entry window
+                if reversal_count == 0 and can_enter_new:
+                    reversal_count += 1
+                    breakout_direction = new_direction
+                    tp_price = _calculate_tp(candle_close, new_direction, tp_distance)
+                    # For reversal, only scale at 50% - and it's a NEW direction so reset executed scales
+                    levels = buy_reversal_levels if new_direction > 0 else sell_reversal_levels
+                    executed_mask = 0
+                    armed_bound = _armed_bound(levels, new_direction, executed_mask)
+                    
+                    row = _open_trade(trades, n_trades, seq, i, new_direction, candle_close,
+                                      tp_price, lot_size * 4, TYPE_REVERSAL)
+                    n_trades += 1
+                    seq += 1
+                    open_direction[n_open] = new_direction
+                    open_entry_price[n_open] = candle_close
+                    open_lot_size[n_open] = lot_size * 4
+                    open_row[n_open] = row
+                    n_open += 1
+                else:
+                    # Second opposite breakout or past the entry window: STOP trading
+                    breakout_direction = 0
+                continue
+        
+        # Update session drawdown from floating P/L - open trades share one direction, so the
+        # candle's worst equity is at its low (BUY) or high (SELL); the close moves the peak
+        if n_open:
+            worst_price = candle_low if breakout_direction > 0 else candle_high
+            worst_equity = balance + _calculate_floating_pnl(
+                n_open, open_direction, open_entry_price, open_lot_size, worst_price, point)
+            close_equity = balance + _calculate_floating_pnl(
+                n_open, open_direction, open_entry_price, open_lot_size, candle_close, point)
+            # Walking high, low, close in order, a BUY candle closing on its high has
+            # already lifted the peak when its low is checked
+            if breakout_direction > 0 and candle_high == candle_close and close_equity > peak_balance:
+                peak_balance = close_equity
+            drawdown = worst_equity - peak_balance
+            if drawdown < max_drawdown:
+                max_drawdown = drawdown
+            # Peak only moves on the close price, not intra-candle
+            if close_equity > peak_balance:
+                peak_balance = close_equity
+    
+    # Force close anything still open at the end of the session's candles
+    if close_at_end and n_open:
+        balance, seq = _close_open_trades(trades, n_open, open_direction, open_entry_price,
+                                          open_lot_size, open_row, closes[n - 1], n - 1,
+                                          EXIT_SESSION_END, seq, balance, point)
+    
+    return trades[:n_trades], max_drawdown
+
+
+# Session windows as minutes since midnight - compared against the int16
+# minute_of_day column, never against datetime.time objects
+MORNING_ENTRY_START_MIN = _minute_of_day(MORNING_ENTRY_START)
+AFTERNOON_ENTRY_START_MIN = _minute_of_day(AFTERNOON_ENTRY_START)
+MORNING_ENTRY_CUTOFF_MIN = _minute_of_day(MORNING_ENTRY_CUTOFF)
+AFTERNOON_EXIT_TIME_MIN = _minute_of_day(AFTERNOON_EXIT_TIME)
+
+
+@njit(cache=True, fastmath=True)
+def _simulate_morning_session(highs, lows, closes, minute_of_day, start, range_high, range_low,
+                              balance, point, tp_units, lot_size, scale_levels,
+                              reversal_scale_levels):
+    """Morning kernel - entries stop at the cutoff, open trades are left open at day end"""
+    return _simulate_session(highs, lows, closes, minute_of_day, start, range_high, range_low,
+                             MORNING_ENTRY_CUTOFF_MIN, END_OF_DAY, False, balance, point,
+                             tp_units, lot_size, scale_levels, reversal_scale_levels)
+
+
+@njit(cache=True, fastmath=True)
+def _simulate_afternoon_session(highs, lows, closes, minute_of_day, start, range_high, range_low,
+                                balance, point, tp_units, lot_size, scale_levels,
+                                reversal_scale_levels):
+    """Afternoon kernel - force close at exit time, or at the last candle if data ends first"""
+    return _simulate_session(highs, lows, closes, minute_of_day, start, range_high, range_low,
+                             END_OF_DAY, AFTERNOON_EXIT_TIME_MIN, True, balance, point,
+                             tp_units, lot_size, scale_levels, reversal_scale_levels)
+
+
+@njit(cache=True, parallel=True)
+def _simulate_days(highs, lows, closes, minute_of_day, day_starts, day_ends, session_starts,
+                   has_range, range_highs, range_lows, point, tp_units, lot_size, scale_levels,
+                   reversal_scale_levels):
+    """
+    Run every day's morning (row 0) and afternoon (row 1) session in parallel.
+    
+    Sessions only share the running balance, which no trading decision reads, so each
+    one starts from a zero balance and the caller books its P/L afterwards (drawdowns
+    are measured from the session's own peak, so they do not depend on the offset).
+    Returns (trades[2, day], trade_counts[2, day], max_drawdowns[2, day]).
+    """
+    n_days = day_starts.shape[0]
+    session_trades = np.zeros((2, n_days, MAX_SESSION_TRADES, N_TRADE_COLS))
+    trade_counts = np.zeros((2, n_days), dtype=np.int64)
+    max_drawdowns = np.zeros((2, n_days))
+    
+    for d in prange(n_days):
+        lo = day_starts[d]
+        hi = day_ends[d]
+        
+        if has_range[0, d]:
+            trades, max_drawdown = _simulate_morning_session(
+                highs[lo:hi], lows[lo:hi], closes[lo:hi], minute_of_day[lo:hi],
+                session_starts[0, d], range_highs[0, d], range_lows[0, d], 0.0, point,
+                tp_units, lot_size, scale_levels, reversal_scale_levels)
+            session_trades[0, d, :trades.shape[0]] = trades
+            trade_counts[0, d] = trades.shape[0]
+            max_drawdowns[0, d] = max_drawdown
+        
+        if has_range[1, d]:
+            trades, max_drawdown = _simulate_afternoon_session(
+                highs[lo:hi], lows[lo:hi], closes[lo:hi], minute_of_day[lo:hi],
+                session_starts[1, d], range_highs[1, d], range_lows[1, d], 0.0, point,
+                tp_units, lot_size, scale_levels, reversal_scale_levels)
+            session_trades[1, d, :trades.shape[0]] = trades
+            trade_counts[1, d] = trades.shape[0]
+            max_drawdowns[1, d] = max_drawdown
+    
+    return session_trades, trade_counts, max_drawdowns
+
+# =============================================================================
+# STATISTICS
+# =============================================================================
+
+def _profit_stats(outcomes: pd.DataFrame, keys, columns: Tuple[str, ...],
+                  labels: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    """
+    Per-key profit aggregates over a (profit, win) frame, rounded for the report.
+    
+    With labels, keys are integer codes into them - grouped as integers and only
+    named afterwards (rows sorted by name, as grouping the strings would give).
+    """
+    stats = outcomes.groupby(keys).agg(
+        total_profit=('profit', 'sum'),
+        avg_profit=('profit', 'mean'),
+        trade_count=('profit', 'count'),
+        win_rate=('win', 'mean')
+    )
+    stats['win_rate'] *= 100
+    if labels is not None:
+        stats.index = np.array(labels, dtype=object)[stats.index.to_numpy()]
+        stats = stats.sort_index()
+    return stats[list(columns)].round(2)
 
 # =============================================================================
 # BACKTESTING ENGINE
@@ -154,27 +639,33 @@ class SessionState:
 class Backtester:
     """Main backtesting engine"""
     
-    def __init__(self, symbol: str, start_date: datetime, end_date: datetime):
+    def __init__(self, symbol: str, start_date: datetime, end_date: datetime,
+                 lot_size: Optional[float] = None):
         self.symbol = symbol
         self.start_date = start_date
         self.end_date = end_date
+        self.lot_size = LOT_SIZE if lot_size is None else lot_size
         self.point = 0.00001  # Will be set from symbol info
         self.digits = 5
+        self.cache_dir: Optional[str] = DATA_CACHE_DIR
         
         # Trading state
         self.morning_state = SessionState("MORNING")
         self.afternoon_state = SessionState("AFTERNOON")
         
         # Results tracking
-        self.all_trades: List[Trade] = []
-        self.closed_trades: List[Trade] = []
-        self.daily_equity: List[Dict] = []
+        self.trade_log = TradeLog()
+        self.daily_equity: Dict[str, np.ndarray] = {}
         self.balance = INITIAL_BALANCE
         
         # Session drawdown tracking
         self.morning_session_drawdowns: List[float] = []
         self.afternoon_session_drawdowns: List[float] = []
         
+        # Per-date (range_high, range_low, candle_count), filled once in run()
+        self.morning_ranges: Dict[datetime.date, Tuple[float, float, int]] = {}
+        self.afternoon_ranges: Dict[datetime.date, Tuple[float, float, int]] = {}
+        
     def initialize(self) -> bool:
         """Initialize MT5 connection"""
         if not mt5.initialize():
@@ -186,722 +677,454 @@ class Backtester:
             logger.error(f"Symbol {self.symbol} not found")
             return False
         
-        self.point = symbol_info.point
-        self.digits = symbol_info.digits
+        self.set_symbol_info(symbol_info.point, symbol_info.digits)
         
         logger.info(f"Backtester initialized for {self.symbol}")
         logger.info(f"Period: {self.start_date.date()} to {self.end_date.date()}")
         return True
     
-    def get_historical_data(self) -> Optional[pd.DataFrame]:
-        """Fetch historical data from MT5"""
-        logger.info("Fetching historical data...")
-        
-        rates = mt5.copy_rates_range(
-            self.symbol,
-            TIMEFRAME,
-            self.start_date,
-            self.end_date
-        )
+    def set_symbol_info(self, point: float, digits: int):
+        """Store the symbol's point size and digits (the point is shared with Trade)"""
+        self.point = point
+        self.digits = digits
+        Trade.point = point
+    
+    def cache_path(self) -> Optional[Path]:
+        """Parquet cache file for this symbol/timeframe/period"""
+        if not self.cache_dir:
+            return None
+        return Path(self.cache_dir) / (f"{self.symbol}_{TIMEFRAME}_"
+                                       f"{self.start_date:%Y%m%d}_{self.end_date:%Y%m%d}.parquet")
+    
+    def load_cached_rates(self) -> Optional[pd.DataFrame]:
+        """Load previously fetched bars from the Parquet cache"""
+        path = self.cache_path()
+        if path is None or not path.exists():
+            return None
         
-        if rates is None or len(rates) == 0:
-            logger.error(f"Failed to fetch historical data: {mt5.last_error()}")
+        try:
+            # Memory-map the file and only materialise the projected columns
+            rates = pd.read_parquet(path, engine='pyarrow', columns=CACHE_COLUMNS, memory_map=True)
+        except (ImportError, OSError, ValueError) as e:
+            logger.warning(f"Could not read bar cache {path}: {e}")
             return None
         
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        df['date'] = df['time'].dt.date
-        df['time_only'] = df['time'].dt.time
-        df['weekday'] = df['time'].dt.day_name()
+        logger.info(f"Loaded cached historical data from {path}")
+        return rates
+    
+    def save_cached_rates(self, rates: pd.DataFrame):
+        """Write fetched bars to the Parquet cache (only for periods that are complete)"""
+        path = self.cache_path()
+        if path is None or self.end_date >= datetime.now():
+            return
         
-        logger.info(f"Loaded {len(df)} candles from {df['time'].min()} to {df['time'].max()}")
-        return df
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            rates.to_parquet(path, compression='snappy', index=False)
+        except (ImportError, OSError) as e:
+            logger.warning(f"Could not write bar cache {path}: {e}")
     
-    def calculate_range(self, df: pd.DataFrame, date: datetime.date, 
-                        start_time: time, end_time: time) -> Optional[Tuple[float, float]]:
-        """Calculate range high/low for a session"""
-        mask = (df['date'] == date) & (df['time_only'] >= start_time) & (df['time_only'] < end_time)
-        range_candles = df[mask]
+    def get_historical_data(self) -> Optional[pd.DataFrame]:
+        """Fetch historical data from the bar cache or MT5"""
+        df = self.load_cached_rates()
         
-        if len(range_candles) < 3:
-            logger.info(f"  Insufficient candles for range {start_time}-{end_time}: {len(range_candles)} candles (need 3+) - session skipped")
-            return None
+        if df is None:
+            logger.info("Fetching historical data...")
+            
+            rates = mt5.copy_rates_range(
+                self.symbol,
+                TIMEFRAME,
+                self.start_date,
+                self.end_date
+            )
+            
+            if rates is None or len(rates) == 0:
+                logger.error(f"Failed to fetch historical data: {mt5.last_error()}")
+                return None
+            
+            # Only the fields the backtest reads - volume/spread columns are never copied
+            df = pd.DataFrame({col: rates[col] for col in CACHE_COLUMNS})
+            self.save_cached_rates(df)
         
-        range_high = range_candles['high'].max()
-        range_low = range_candles['low'].min()
+        if PRICE_DTYPE != np.float64:
+            price_columns = ['open', 'high', 'low', 'close']
+            df[price_columns] = df[price_columns].astype(PRICE_DTYPE)
         
-        return range_high, range_low
-    
-    def calculate_tp(self, breakout_price: float, direction: str) -> float:
-        """Calculate take profit price"""
-        tp_distance = TP_UNITS * self.point
+        # Calendar fields straight from the epoch seconds (1970-01-01 was a Thursday)
+        epoch_seconds = df['time'].to_numpy().astype(np.int64)
+        df['time'] = pd.to_datetime(epoch_seconds, unit='s')
+        df['minute_of_day'] = (epoch_seconds // 60 % 1440).astype(np.int16)
+        df['weekday'] = ((epoch_seconds // 86400 + 3) % 7).astype(np.int8)
         
-        if direction == "BUY":
-            return breakout_price + tp_distance
-        else:
-            return breakout_price - tp_distance
+        logger.info(f"Loaded {len(df)} candles from {df['time'].min()} to {df['time'].max()}")
+        return df
     
-    def calculate_scale_levels(self, range_high: float, range_low: float, 
-                               direction: str, is_reversal: bool = False) -> List[float]:
-        """Calculate scaling entry prices"""
-        range_size = range_high - range_low
-        
-        # For reversal trades, only scale at 50%
-        # For initial breakout, scale at 75%, 50%, 25%
-        if is_reversal:
-            percentages = np.array([0.50])  # Only 50% level on reversal
-        else:
-            percentages = np.array(SCALE_LEVELS)  # All levels on initial breakout
+    def calculate_ranges(self, candle_keys: np.ndarray, unique_days: np.ndarray,
+                         highs: np.ndarray, lows: np.ndarray, start_time: time,
+                         end_time: time) -> Dict[datetime.date, Tuple[float, float, int]]:
+        """Calculate range high/low and candle count for every date in one grouped pass"""
+        # Each day's range candles are the contiguous [lo, hi) slice of the sorted
+        # (day, minute) keys, so no full-length mask or filtered copy is needed
+        day_keys = unique_days.astype(np.int64) * 1440
+        lo = np.searchsorted(candle_keys, day_keys + _minute_of_day(start_time))
+        hi = np.searchsorted(candle_keys, day_keys + _minute_of_day(end_time))
+        nonempty = hi > lo
+        if not nonempty.any():
+            return {}
         
-        if direction == "BUY":
-            levels = range_high - (percentages * range_size)
-        else:
-            levels = range_low + (percentages * range_size)
+        # Interleaved [lo, hi) bounds - every other reduceat segment is a range window
+        bounds = np.column_stack((lo[nonempty], hi[nonempty])).ravel()
+        if bounds[-1] == len(highs):
+            bounds = bounds[:-1]
+        range_highs = np.maximum.reduceat(highs, bounds)[::2]
+        range_lows = np.minimum.reduceat(lows, bounds)[::2]
+        counts = (hi - lo)[nonempty]
         
-        return levels.tolist()
+        return {day.astype(object): (high, low, int(count))
+                for day, high, low, count in zip(unique_days[nonempty], range_highs, range_lows, counts)}
     
-    def check_tp_hit(self, trade: Trade, candle: pd.Series) -> bool:
-        """Check if take profit was hit"""
-        if trade.direction == "BUY":
-            return candle['high'] >= trade.tp_price
-        else:
-            return candle['low'] <= trade.tp_price
+    def calculate_range(self, ranges: Dict[datetime.date, Tuple[float, float, int]],
+                        date: datetime.date, start_time: time,
+                        end_time: time) -> Optional[Tuple[float, float]]:
+        """Look up the precomputed range high/low for a session"""
+        range_high, range_low, count = ranges.get(date, (None, None, 0))
+        
+        if count < MIN_RANGE_CANDLES:
+            logger.info("  Insufficient candles for range %s-%s: %d candles (need %d+) - session skipped",
+                        start_time, end_time, count, MIN_RANGE_CANDLES)
+            return None
+        
+        return range_high, range_low
     
-    def open_trade(self, direction: str, entry_price: float, entry_time: datetime,
-                   tp_price: float, trade_type: str, session: str, lot_size: float = None) -> Trade:
-        """Open a new trade"""
+    def open_trade(self, state: SessionState, direction: int, entry_price: float,
+                   entry_time: datetime, tp_price: float, trade_type: str,
+                   lot_size: float = None) -> Trade:
+        """Create a trade opened by the session kernel"""
         if lot_size is None:
-            lot_size = LOT_SIZE
+            lot_size = self.lot_size
         
-        trade = Trade(
+        return Trade(
             direction=direction,
             entry_price=entry_price,
             entry_time=entry_time,
             lot_size=lot_size,
             tp_price=tp_price,
             trade_type=trade_type,
-            session=session
+            session=state.session_type
         )
-        self.all_trades.append(trade)
-        return trade
-    
-    def close_trade(self, trade: Trade, exit_price: float, exit_time: datetime, 
-                    exit_reason: str):
-        """Close a trade"""
-        trade.close(exit_price, exit_time, exit_reason, self.point)
-        self.closed_trades.append(trade)
+    
+    def close_trade(self, trade: Trade, exit_price: float, exit_time: datetime, exit_reason: str,
+                    pips: float, profit: float):
+        """Close a trade with its precomputed P/L and book the profit"""
+        trade.settle(exit_price, exit_time, exit_reason, pips, profit)
+        self.trade_log.push(trade)
         self.balance += trade.profit
         
-        logger.info(f"  Trade closed: {trade.direction} {trade.trade_type} | "
-                   f"Entry: {trade.entry_price:.5f} | Exit: {exit_price:.5f} | "
-                   f"Profit: ${trade.profit:.2f} ({trade.pips:.1f} pips) | {exit_reason}")
-    
-    def close_all_session_trades(self, state: SessionState, exit_price: float,
-                                  exit_time: datetime, exit_reason: str):
-        """Close all trades for a session"""
-        for trade in state.open_trades:
-            self.close_trade(trade, exit_price, exit_time, exit_reason)
-        state.open_trades = []
-    
-    def calculate_floating_pnl(self, state: SessionState, current_price: float) -> float:
-        """Calculate floating profit/loss for open trades in a session"""
-        floating_pnl = 0.0
-        trade_details = []
-        
-        for trade in state.open_trades:
-            if trade.direction == "BUY":
-                pips = (current_price - trade.entry_price) / self.point / 10
-            else:
-                pips = (trade.entry_price - current_price) / self.point / 10
-            
-            pip_value = trade.lot_size * 100
-            profit = pips * pip_value
-            floating_pnl += profit
-            
-            # Store for debug logging
-            trade_details.append({
-                'type': trade.trade_type,
-                'direction': trade.direction,
-                'entry': trade.entry_price,
-                'current': current_price,
-                'lot_size': trade.lot_size,
-                'pips': pips,
-                'profit': profit
-            })
-        
-        # Log detailed calculation when we have a significant drawdown
-        if floating_pnl < -100:  # Only log when drawdown exceeds $100
-            logger.debug(f"\n  === DRAWDOWN CALCULATION @ Price {current_price:.5f} ===")
-            logger.debug(f"  Open Trades: {len(state.open_trades)}")
-            for i, detail in enumerate(trade_details, 1):
-                logger.debug(f"    Trade {i}: {detail['direction']} {detail['type']} | "
-                           f"Entry: {detail['entry']:.5f} | Lot: {detail['lot_size']:.2f} | "
-                           f"Pips: {detail['pips']:.1f} | P/L: ${detail['profit']:.2f}")
-            logger.debug(f"  TOTAL Floating P/L: ${floating_pnl:.2f}")
-            logger.debug(f"  ===================================")
-        
-        return floating_pnl
-    
-    def update_session_drawdown(self, state: SessionState, candle_high: float, candle_low: float, candle_close: float):
-        """Update session drawdown based on floating P/L at WORST price point in candle"""
-        # Check drawdown at BOTH high and low to capture worst moment for open positions
-        # For BUY positions: worst is at candle LOW
-        # For SELL positions: worst is at candle HIGH
-        # We check both to get the most accurate drawdown
-        
-        prices_to_check = [candle_high, candle_low, candle_close]
-        
-        for price in prices_to_check:
-            # Calculate current equity (balance + floating P/L at this price)
-            floating_pnl = self.calculate_floating_pnl(state, price)
-            current_equity = self.balance + floating_pnl
-            
-            # Update peak balance (only from close price, not intra-candle)
-            if price == candle_close and current_equity > state.session_peak_balance:
-                state.session_peak_balance = current_equity
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info("  Trade closed: %s %s | Entry: %.5f | Exit: %.5f | Profit: $%.2f (%.1f pips) | %s",
+                    DIRECTION_NAMES[trade.direction], trade.trade_type, trade.entry_price,
+                    exit_price, trade.profit, trade.pips, exit_reason)
+    
+    def simulate_sessions(self, bars: Dict[str, np.ndarray], candle_keys: np.ndarray,
+                          dates: List[datetime.date], day_starts: np.ndarray,
+                          day_ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Run every day's sessions in one parallel kernel call (row 0 morning, row 1 afternoon)"""
+        n_days = len(dates)
+        has_range = np.zeros((2, n_days), dtype=np.bool_)
+        range_highs = np.zeros((2, n_days))
+        range_lows = np.zeros((2, n_days))
+        session_starts = np.zeros((2, n_days), dtype=np.int64)
+        
+        # (day, minute) keys are sorted across the whole series, so one searchsorted
+        # finds every day's first entry candle
+        day_numbers = np.array(dates, dtype='datetime64[D]').astype(np.int64)
+        for s, entry_start in enumerate((MORNING_ENTRY_START_MIN, AFTERNOON_ENTRY_START_MIN)):
+            session_keys = day_numbers * 1440 + entry_start
+            session_starts[s] = np.searchsorted(candle_keys, session_keys) - day_starts
+        
+        for s, ranges in enumerate((self.morning_ranges, self.afternoon_ranges)):
+            for d, date in enumerate(dates):
+                range_high, range_low, count = ranges.get(date, (0.0, 0.0, 0))
+                has_range[s, d] = count >= MIN_RANGE_CANDLES
+                range_highs[s, d] = range_high
+                range_lows[s, d] = range_low
+        
+        return _simulate_days(
+            bars['high'], bars['low'], bars['close'], bars['minute_of_day'],
+            day_starts, day_ends, session_starts, has_range, range_highs, range_lows,
+            self.point, TP_UNITS, self.lot_size, SCALE_LEVELS, REVERSAL_SCALE_LEVELS
+        )
+    
+    def record_session_trades(self, state: SessionState, trades: np.ndarray, times: np.ndarray):
+        """Replay the kernel's trade table in event order - build, close and log each trade"""
+        label = state.session_type.capitalize()
+        log_entries = logger.isEnabledFor(logging.INFO)
+        
+        events = []
+        for row in range(len(trades)):
+            events.append((trades[row, COL_ENTRY_SEQ], row, False))
+            if trades[row, COL_EXIT_BAR] >= 0:
+                events.append((trades[row, COL_EXIT_SEQ], row, True))
+        events.sort()
+        
+        # P/L of every closed row in one vectorized pass (open rows are never read)
+        pips, profits = Trade.pnl(trades[:, COL_DIRECTION], trades[:, COL_ENTRY_PRICE],
+                                  trades[:, COL_EXIT_PRICE], trades[:, COL_LOT_SIZE])
+        
+        opened: Dict[int, Trade] = {}
+        for _, row, is_close in events:
+            t = trades[row]
+            if is_close:
+                exit_time = pd.Timestamp(times[int(t[COL_EXIT_BAR])])
+                self.close_trade(opened.pop(row), float(t[COL_EXIT_PRICE]), exit_time,
+                                 EXIT_REASONS[int(t[COL_EXIT_REASON])],
+                                 float(pips[row]), float(profits[row]))
+                continue
             
-            # Calculate drawdown from peak
-            drawdown = current_equity - state.session_peak_balance
+            direction = int(t[COL_DIRECTION])
+            trade_type = TRADE_TYPES[int(t[COL_TRADE_TYPE])]
+            trade = self.open_trade(state, direction, float(t[COL_ENTRY_PRICE]),
+                                    pd.Timestamp(times[int(t[COL_ENTRY_BAR])]),
+                                    float(t[COL_TP_PRICE]), trade_type,
+                                    lot_size=float(t[COL_LOT_SIZE]))
+            opened[row] = trade
             
-            # Update maximum drawdown (most negative value)
-            if drawdown < state.session_max_drawdown:
-                state.session_max_drawdown = drawdown
+            if not log_entries:
+                continue
+            side = DIRECTION_NAMES[direction]
+            if trade_type == "INITIAL":
+                logger.info("  %s BREAKOUT: %s @ %.5f, TP: %.5f", label, side, trade.entry_price, trade.tp_price)
+            elif trade_type == "SCALE":
+                logger.info("  %s SCALE: %s @ %.5f with %.1fx lot", label, side, trade.entry_price,
+                            trade.lot_size / self.lot_size)
+            else:
+                logger.info("  %s REVERSAL #1: %s - opening reversal positions (candle closed @ %.5f)",
+                            label, side, trade.entry_price)
     
-    def process_morning_session(self, df_day: pd.DataFrame, date: datetime.date):
-        """Process morning trading session"""
-        state = self.morning_state
+    def process_session(self, state: SessionState, ranges: Dict[datetime.date, Tuple[float, float, int]],
+                        range_start: time, range_end: time, session_drawdowns: List[float],
+                        day_bars: Dict[str, np.ndarray], date: datetime.date,
+                        trades: np.ndarray, max_drawdown: float):
+        """Book one session's simulated trades and drawdown (shared by morning and afternoon)"""
+        label = state.session_type.capitalize()
         
         # Initialize session balance tracking
         state.session_start_balance = self.balance
-        state.session_peak_balance = self.balance
         state.session_max_drawdown = 0.0
         
         # Calculate range if not done
         if state.range_high is None:
-            range_result = self.calculate_range(df_day, date, MORNING_RANGE_START, MORNING_RANGE_END)
+            range_result = self.calculate_range(ranges, date, range_start, range_end)
             if range_result:
                 state.range_high, state.range_low = range_result
-                logger.info(f"  Morning range: {state.range_high:.5f} - {state.range_low:.5f}")
+                logger.info("  %s range: %.5f - %.5f", label, state.range_high, state.range_low)
         
         if state.range_high is None:
             return
         
-        # Get candles after entry start time
-        entry_candles = df_day[df_day['time_only'] >= MORNING_ENTRY_START].copy()
-        
-        for idx, candle in entry_candles.iterrows():
-            current_time = candle['time']
-            current_time_only = candle['time_only']
-            
-            # Check if past entry cutoff for new trades
-            can_enter_new = current_time_only <= MORNING_ENTRY_CUTOFF
-            
-            # Check for initial breakout (only once per session!)
-            if not state.initial_breakout_done and can_enter_new:
-                # Check for buy breakout
-                if candle['close'] > state.range_high:
-                    state.breakout_direction = "BUY"
-                    state.breakout_price = candle['close']
-                    state.tp_price = self.calculate_tp(state.breakout_price, "BUY")
-                    state.scale_levels = self.calculate_scale_levels(
-                        state.range_high, state.range_low, "BUY"
-                    )
-                    state.initial_breakout_done = True  # Mark that initial breakout happened
-                    state.breakout_candle_time = candle['time']  # Store breakout candle timestamp
-                    
-                    # Open initial trade
-                    trade = self.open_trade("BUY", candle['close'], current_time,
-                                           state.tp_price, "INITIAL", "MORNING")
-                    state.open_trades.append(trade)
-                    logger.info(f"  Morning BREAKOUT: BUY @ {candle['close']:.5f}, TP: {state.tp_price:.5f}")
-                    # Skip rest of processing for this candle - start fresh on next candle
-                    continue
-                
-                # Check for sell breakout
-                elif candle['close'] < state.range_low:
-                    state.breakout_direction = "SELL"
-                    state.breakout_price = candle['close']
-                    state.tp_price = self.calculate_tp(state.breakout_price, "SELL")
-                    state.scale_levels = self.calculate_scale_levels(
-                        state.range_high, state.range_low, "SELL"
-                    )
-                    state.initial_breakout_done = True  # Mark that initial breakout happened
-                    state.breakout_candle_time = candle['time']  # Store breakout candle timestamp
-                    
-                    # Open initial trade
-                    trade = self.open_trade("SELL", candle['close'], current_time,
-                                           state.tp_price, "INITIAL", "MORNING")
-                    state.open_trades.append(trade)
-                    logger.info(f"  Morning BREAKOUT: SELL @ {candle['close']:.5f}, TP: {state.tp_price:.5f}")
-                    # Skip rest of processing for this candle - start fresh on next candle
-                    continue
-            
-            # Manage existing trades
-            if state.breakout_direction is not None:
-                # Check for TP hit (only if we have open trades)
-                if state.open_trades:
-                    tp_hit = False
-                    for trade in state.open_trades[:]:
-                        if self.check_tp_hit(trade, candle):
-                            self.close_trade(trade, state.tp_price, current_time, "TP")
-                            state.open_trades.remove(trade)
-                            tp_hit = True
-                    
-                    if tp_hit:
-                        # Close all trades when TP is hit
-                        self.close_all_session_trades(state, state.tp_price, current_time, "TP")
-                        # DON'T reset executed_scales - each level should only trigger once per session!
-                        logger.info(f"  TP hit - positions closed, monitoring for remaining scale levels")
-                        # DON'T continue - keep monitoring for pullbacks and reversals!
-                
-                # Check for scaling FIRST (before reversal check)
-                # This ensures that if a candle sweeps through multiple levels and triggers reversal,
-                # all scale positions are opened before being closed by the reversal
-                # BUT: Only check scales if we're on a NEW candle (after breakout candle)
-                can_check_scales = True
-                if state.breakout_candle_time is not None:
-                    if candle['time'] <= state.breakout_candle_time:
-                        can_check_scales = False
-                
-                if can_check_scales:
-                    for level_index, level in enumerate(state.scale_levels):
-                        if level in state.executed_scales:
-                            continue
-                        
-                        triggered = False
-                        if state.breakout_direction == "BUY":
-                            if candle['low'] <= level:
-                                triggered = True
-                        else:
-                            if candle['high'] >= level:
-                                triggered = True
-                        
-                        if triggered:
-                            # Check if still within entry window for morning
-                            if not can_enter_new:
-                                logger.info(f"  Morning: Scale level {level:.5f} triggered but past entry cutoff ({MORNING_ENTRY_CUTOFF}) - skipping")
-                                continue
-                            
-                            # Determine lot size based on scale order
-                            if state.reversal_count >= 1:
-                                # For reversal: only 1 scale (50%) with 4x lot size
-                                lot_size = LOT_SIZE * 8
-                                # lot_size = LOT_SIZE * 2
-                            else:
-                                # For initial breakout: 75%=4x, 50%=3x, 25%=2x
-                                # Reverse the index so deepest pullback gets most size
-                                lot_size = LOT_SIZE * (4 - level_index)  # 0->4x, 1->3x, 2->2x
-                                # lot_size = LOT_SIZE
-
-                            trade = self.open_trade(state.breakout_direction, level, current_time,
-                                                   state.tp_price, "SCALE", "MORNING",
-                                                   lot_size=lot_size)
-                            state.open_trades.append(trade)
-                            state.executed_scales.append(level)
-                            trigger_price = candle['low'] if state.breakout_direction == "BUY" else candle['high']
-                            logger.info(f"  Morning SCALE: {state.breakout_direction} @ {level:.5f} with {lot_size/LOT_SIZE:.1f}x lot (candle {'low' if state.breakout_direction == 'BUY' else 'high'}: {trigger_price:.5f})")
-                
-                # Check for reversal AFTER scaling (only if we have open trades OR no trades yet)
-                reversal = False
-                if state.breakout_direction == "BUY" and candle['close'] < state.range_low:
-                    reversal = True
-                    new_direction = "SELL"
-                elif state.breakout_direction == "SELL" and candle['close'] > state.range_high:
-                    reversal = True
-                    new_direction = "BUY"
-                
-                if reversal:
-                    # Close all existing trades (if any)
-                    if state.open_trades:
-                        self.close_all_session_trades(state, candle['close'], current_time, "REVERSAL")
-                    
-                    # Only allow reversals if within entry time window
-                    if not can_enter_new:
-                        logger.info(f"  Morning: Reversal detected but past entry cutoff ({MORNING_ENTRY_CUTOFF}) - positions closed, STOP TRADING")
-                        state.breakout_direction = None  # Stop trading for this session
-                        continue
-                    
-                    # Only allow ONE reversal per session with new positions
-                    if state.reversal_count == 0:
-                        # First reversal: open new positions in opposite direction
-                        logger.info(f"  Morning REVERSAL #1: {new_direction} - opening reversal positions (candle closed @ {candle['close']:.5f}, {'below' if new_direction == 'SELL' else 'above'} range)")
-                        state.reversal_count += 1
-                        state.breakout_direction = new_direction
-                        state.breakout_price = candle['close']
-                        state.tp_price = self.calculate_tp(state.breakout_price, new_direction)
-                        # For reversal, only scale at 50%
-                        state.scale_levels = self.calculate_scale_levels(
-                            state.range_high, state.range_low, new_direction, is_reversal=True
-                        )
-                        # Reset executed_scales for reversal - it's a NEW direction
-                        # Even if 50% is same price, it's opposite direction so should be allowed
-                        state.executed_scales = []
-                        
-                        trade = self.open_trade(new_direction, candle['close'], current_time,
-                                               state.tp_price, "REVERSAL", "MORNING",
-                                               lot_size=LOT_SIZE * 4)
-                        state.open_trades.append(trade)
-                    else:
-                        # Second (or more) opposite breakout: just close all and STOP trading
-                        logger.info(f"  Morning: Second opposite breakout detected (candle closed @ {candle['close']:.5f}) - closing all positions, STOP TRADING")
-                        state.reversal_count += 1
-                        state.breakout_direction = None  # Stop trading for this session
-                    continue
-            
-            # Update session drawdown tracking after processing each candle
-            if state.open_trades:
-                self.update_session_drawdown(state, candle['high'], candle['low'], candle['close'])
+        # Trades and drawdown were simulated up front by simulate_sessions
+        state.session_max_drawdown = max_drawdown
+        self.record_session_trades(state, trades, day_bars['time'])
         
-        # Store and log the maximum drawdown for this morning session
+        # Store and log the maximum drawdown for this session
         if state.session_max_drawdown < 0:
-            self.morning_session_drawdowns.append(state.session_max_drawdown)
-            logger.info(f"  Morning session MAX DRAWDOWN: ${state.session_max_drawdown:.2f}")
+            session_drawdowns.append(state.session_max_drawdown)
+            logger.info("  %s session MAX DRAWDOWN: $%.2f", label, state.session_max_drawdown)
         elif state.session_start_balance > 0:
-            logger.info(f"  Morning session MAX DRAWDOWN: $0.00 (no drawdown)")
+            logger.info("  %s session MAX DRAWDOWN: $0.00 (no drawdown)", label)
     
-    def process_afternoon_session(self, df_day: pd.DataFrame, date: datetime.date):
+    def process_morning_session(self, day_bars: Dict[str, np.ndarray], date: datetime.date,
+                                trades: np.ndarray, max_drawdown: float):
+        """Process morning trading session"""
+        self.process_session(self.morning_state, self.morning_ranges, MORNING_RANGE_START,
+                             MORNING_RANGE_END, self.morning_session_drawdowns,
+                             day_bars, date, trades, max_drawdown)
+    
+    def process_afternoon_session(self, day_bars: Dict[str, np.ndarray], date: datetime.date,
+                                  trades: np.ndarray, max_drawdown: float):
         """Process afternoon trading session"""
-        state = self.afternoon_state
-        
-        # Initialize session balance tracking
-        state.session_start_balance = self.balance
-        state.session_peak_balance = self.balance
-        state.session_max_drawdown = 0.0
-        
-        # Calculate range if not done
-        if state.range_high is None:
-            range_result = self.calculate_range(df_day, date, AFTERNOON_RANGE_START, AFTERNOON_RANGE_END)
-            if range_result:
-                state.range_high, state.range_low = range_result
-                logger.info(f"  Afternoon range: {state.range_high:.5f} - {state.range_low:.5f}")
-        
-        if state.range_high is None:
-            return
-        
-        # Get candles after entry start time
-        entry_candles = df_day[df_day['time_only'] >= AFTERNOON_ENTRY_START].copy()
-        
-        for idx, candle in entry_candles.iterrows():
-            current_time = candle['time']
-            current_time_only = candle['time_only']
-            
-            # Force close at exit time
-            if current_time_only >= AFTERNOON_EXIT_TIME:
-                if state.open_trades:
-                    logger.info(f"  Afternoon FORCE CLOSE at {AFTERNOON_EXIT_TIME}")
-                    self.close_all_session_trades(state, candle['close'], current_time, "TIME_EXIT")
-                break
-            
-            # Check for initial breakout (only once per session!)
-            if not state.initial_breakout_done:
-                if candle['close'] > state.range_high:
-                    state.breakout_direction = "BUY"
-                    state.breakout_price = candle['close']
-                    state.tp_price = self.calculate_tp(state.breakout_price, "BUY")
-                    state.scale_levels = self.calculate_scale_levels(
-                        state.range_high, state.range_low, "BUY"
-                    )
-                    state.initial_breakout_done = True  # Mark that initial breakout happened
-                    state.breakout_candle_time = candle['time']  # Store breakout candle timestamp
-                    
-                    trade = self.open_trade("BUY", candle['close'], current_time,
-                                           state.tp_price, "INITIAL", "AFTERNOON")
-                    state.open_trades.append(trade)
-                    logger.info(f"  Afternoon BREAKOUT: BUY @ {candle['close']:.5f}, TP: {state.tp_price:.5f}")
-                    # Skip rest of processing for this candle - start fresh on next candle
-                    continue
-                
-                elif candle['close'] < state.range_low:
-                    state.breakout_direction = "SELL"
-                    state.breakout_price = candle['close']
-                    state.tp_price = self.calculate_tp(state.breakout_price, "SELL")
-                    state.scale_levels = self.calculate_scale_levels(
-                        state.range_high, state.range_low, "SELL"
-                    )
-                    state.initial_breakout_done = True  # Mark that initial breakout happened
-                    state.breakout_candle_time = candle['time']  # Store breakout candle timestamp
-                    
-                    trade = self.open_trade("SELL", candle['close'], current_time,
-                                           state.tp_price, "INITIAL", "AFTERNOON")
-                    state.open_trades.append(trade)
-                    logger.info(f"  Afternoon BREAKOUT: SELL @ {candle['close']:.5f}, TP: {state.tp_price:.5f}")
-                    # Skip rest of processing for this candle - start fresh on next candle
-                    continue
-            
-            # Manage existing trades
-            if state.breakout_direction is not None:
-                # Check for TP hit (only if we have open trades)
-                if state.open_trades:
-                    tp_hit = False
-                    for trade in state.open_trades[:]:
-                        if self.check_tp_hit(trade, candle):
-                            self.close_trade(trade, state.tp_price, current_time, "TP")
-                            state.open_trades.remove(trade)
-                            tp_hit = True
-                    
-                    if tp_hit:
-                        # Close all trades when TP is hit
-                        self.close_all_session_trades(state, state.tp_price, current_time, "TP")
-                        # DON'T reset executed_scales - each level should only trigger once per session!
-                        logger.info(f"  TP hit - positions closed, monitoring for remaining scale levels")
-                        # DON'T continue - keep monitoring for pullbacks and reversals!
-                
-                # Check for scaling FIRST (before reversal check)
-                # This ensures that if a candle sweeps through multiple levels and triggers reversal,
-                # all scale positions are opened before being closed by the reversal
-                # BUT: Only check scales if we're on a NEW candle (after breakout candle)
-                can_check_scales = True
-                if state.breakout_candle_time is not None:
-                    if candle['time'] <= state.breakout_candle_time:
-                        can_check_scales = False
-                
-                if can_check_scales:
-                    for level_index, level in enumerate(state.scale_levels):
-                        if level in state.executed_scales:
-                            continue
-                        
-                        triggered = False
-                        if state.breakout_direction == "BUY":
-                            if candle['low'] <= level:
-                                triggered = True
-                        else:
-                            if candle['high'] >= level:
-                                triggered = True
-                        
-                        if triggered:
-                            # Check if still within trading window for afternoon
-                            if current_time_only >= AFTERNOON_EXIT_TIME:
-                                logger.info(f"  Afternoon: Scale level {level:.5f} triggered but past exit time ({AFTERNOON_EXIT_TIME}) - skipping")
-                                continue
-                            
-                            # Determine lot size based on scale order
-                            if state.reversal_count >= 1:
-                                # For reversal: only 1 scale (50%) with 4x lot size
-                                lot_size = LOT_SIZE * 8
-                                # lot_size = LOT_SIZE * 2
-                            else:
-                                # For initial breakout: 75%=4x, 50%=3x, 25%=2x
-                                # Reverse the index so deepest pullback gets most size
-                                lot_size = LOT_SIZE * (4 - level_index)  # 0->4x, 1->3x, 2->2x
-                                # lot_size = LOT_SIZE
-                            
-                            trade = self.open_trade(state.breakout_direction, level, current_time,
-                                                   state.tp_price, "SCALE", "AFTERNOON",
-                                                   lot_size=lot_size)
-                            state.open_trades.append(trade)
-                            state.executed_scales.append(level)
-                            trigger_price = candle['low'] if state.breakout_direction == "BUY" else candle['high']
-                            logger.info(f"  Afternoon SCALE: {state.breakout_direction} @ {level:.5f} with {lot_size/LOT_SIZE:.1f}x lot (candle {'low' if state.breakout_direction == 'BUY' else 'high'}: {trigger_price:.5f})")
-                
-                # Check for reversal AFTER scaling (only if we have open trades OR no trades yet)
-                reversal = False
-                if state.breakout_direction == "BUY" and candle['close'] < state.range_low:
-                    reversal = True
-                    new_direction = "SELL"
-                elif state.breakout_direction == "SELL" and candle['close'] > state.range_high:
-                    reversal = True
-                    new_direction = "BUY"
-                
-                if reversal:
-                    # Close all existing trades (if any)
-                    if state.open_trades:
-                        self.close_all_session_trades(state, candle['close'], current_time, "REVERSAL")
-                    
-                    # Check if still within trading window for afternoon
-                    if current_time_only >= AFTERNOON_EXIT_TIME:
-                        logger.info(f"  Afternoon: Reversal detected but past exit time ({AFTERNOON_EXIT_TIME}) - positions closed, STOP TRADING")
-                        state.breakout_direction = None  # Stop trading for this session
-                        continue
-                    
-                    # Only allow ONE reversal per session with new positions
-                    if state.reversal_count == 0:
-                        # First reversal: open new positions in opposite direction
-                        logger.info(f"  Afternoon REVERSAL #1: {new_direction} - opening reversal positions (candle closed @ {candle['close']:.5f}, {'below' if new_direction == 'SELL' else 'above'} range)")
-                        state.reversal_count += 1
-                        state.breakout_direction = new_direction
-                        state.breakout_price = candle['close']
-                        state.tp_price = self.calculate_tp(state.breakout_price, new_direction)
-                        # For reversal, only scale at 50%
-                        state.scale_levels = self.calculate_scale_levels(
-                            state.range_high, state.range_low, new_direction, is_reversal=True
-                        )
-                        # Reset executed_scales for reversal - it's a NEW direction
-                        # Even if 50% is same price, it's opposite direction so should be allowed
-                        state.executed_scales = []
-                        
-                        trade = self.open_trade(new_direction, candle['close'], current_time,
-                                               state.tp_price, "REVERSAL", "AFTERNOON",
-                                               lot_size=LOT_SIZE * 4)
-                        state.open_trades.append(trade)
-                    else:
-                        # Second (or more) opposite breakout: just close all and STOP trading
-                        logger.info(f"  Afternoon: Second opposite breakout detected (candle closed @ {candle['close']:.5f}) - closing all positions, STOP TRADING")
-                        state.reversal_count += 1
-                        state.breakout_direction = None  # Stop trading for this session
-                    continue
-            
-            # Update session drawdown tracking after processing each candle
-            if state.open_trades:
-                self.update_session_drawdown(state, candle['high'], candle['low'], candle['close'])
-        
-        # Force close any remaining open trades at end of afternoon session
-        # (In case data doesn't have candles until AFTERNOON_EXIT_TIME)
-        if state.open_trades:
-            last_candle = entry_candles.iloc[-1]
-            logger.info(f"  Afternoon FORCE CLOSE - End of session (data ended at {last_candle['time_only']}, {len(state.open_trades)} positions still open)")
-            self.close_all_session_trades(state, last_candle['close'], last_candle['time'], "SESSION_END")
-        
-        # Store and log the maximum drawdown for this afternoon session
-        if state.session_max_drawdown < 0:
-            self.afternoon_session_drawdowns.append(state.session_max_drawdown)
-            logger.info(f"  Afternoon session MAX DRAWDOWN: ${state.session_max_drawdown:.2f}")
-        elif state.session_start_balance > 0:
-            logger.info(f"  Afternoon session MAX DRAWDOWN: $0.00 (no drawdown)")
+        self.process_session(self.afternoon_state, self.afternoon_ranges, AFTERNOON_RANGE_START,
+                             AFTERNOON_RANGE_END, self.afternoon_session_drawdowns,
+                             day_bars, date, trades, max_drawdown)
     
-    def run(self) -> Dict:
-        """Run the backtest"""
-        df = self.get_historical_data()
+    def run(self, df: Optional[pd.DataFrame] = None) -> Dict:
+        """Run the backtest (on already-fetched bars if df is given)"""
+        if df is None:
+            df = self.get_historical_data()
         if df is None:
             return {}
         
-        # Group by date
-        unique_dates = sorted(df['date'].unique())
+        # Bars as plain NumPy columns - each day is a contiguous slice of them
+        bars = {col: df[col].to_numpy() for col in ('time', 'high', 'low', 'close', 'minute_of_day')}
+        days = bars['time'].astype('datetime64[D]')
+        unique_days = np.unique(days)
+        day_starts = np.searchsorted(days, unique_days, side='left')
+        day_ends = np.searchsorted(days, unique_days, side='right')
+        dates = [day.astype(object) for day in unique_days]
+        weekdays = df['weekday'].to_numpy()[day_starts]
+        # Globally sorted (day, minute) keys locate any session window with a binary search
+        candle_keys = days.astype(np.int64) * 1440 + bars['minute_of_day']
+        
+        # Session ranges for every date up front
+        self.morning_ranges = self.calculate_ranges(candle_keys, unique_days, bars['high'], bars['low'],
+                                                    MORNING_RANGE_START, MORNING_RANGE_END)
+        self.afternoon_ranges = self.calculate_ranges(candle_keys, unique_days, bars['high'], bars['low'],
+                                                      AFTERNOON_RANGE_START, AFTERNOON_RANGE_END)
+        
+        # Days are independent apart from the balance, so every session is simulated in parallel
+        # here and the loop below only books the trades in order
+        session_trades, trade_counts, max_drawdowns = self.simulate_sessions(
+            bars, candle_keys, dates, day_starts, day_ends)
+        # Every kernel trade row is an upper bound on the trades that will close
+        self.trade_log.reserve(len(self.trade_log) + int(trade_counts.sum()))
         
         logger.info(f"\nStarting backtest simulation...")
-        logger.info(f"Trading {len(unique_dates)} days\n")
+        logger.info(f"Trading {len(unique_days)} days\n")
         
-        for date in unique_dates:
+        # Daily equity columns with one slot per date - weekend slots are dropped afterwards
+        traded = np.zeros(len(dates), dtype=np.bool_)
+        balances = np.zeros(len(dates))
+        daily_profits = np.zeros(len(dates))
+        
+        for d, date in enumerate(dates):
             # Skip weekends
-            weekday = pd.Timestamp(date).day_name()
-            if weekday in ['Saturday', 'Sunday']:
+            if weekdays[d] >= SATURDAY:
                 continue
+            weekday = WEEKDAY_NAMES[weekdays[d]]
             
-            logger.info(f"Trading day: {date} ({weekday})")
+            logger.info("Trading day: %s (%s)", date, weekday)
             
             # Reset daily state
             self.morning_state.reset()
             self.afternoon_state.reset()
             
-            # Get day's data
-            df_day = df[df['date'] == date].copy()
-            
-            if len(df_day) == 0:
-                continue
+            # Get day's data (views, no copies)
+            day_bars = {col: values[day_starts[d]:day_ends[d]] for col, values in bars.items()}
             
             # Track balance at start of day
             balance_start = self.balance
             
             # Process sessions
-            self.process_morning_session(df_day, date)
-            self.process_afternoon_session(df_day, date)
+            self.process_morning_session(day_bars, date, session_trades[0, d, :trade_counts[0, d]],
+                                         max_drawdowns[0, d])
+            self.process_afternoon_session(day_bars, date, session_trades[1, d, :trade_counts[1, d]],
+                                           max_drawdowns[1, d])
             
             # Record daily equity
             daily_profit = self.balance - balance_start
-            self.daily_equity.append({
-                'date': date,
-                'weekday': weekday,
-                'balance': self.balance,
-                'daily_profit': daily_profit,
-                'trades_closed': len([t for t in self.closed_trades 
-                                     if t.exit_time.date() == date])
-            })
+            traded[d] = True
+            balances[d] = self.balance
+            daily_profits[d] = daily_profit
             
-            logger.info(f"  End of day balance: ${self.balance:.2f} (Daily P/L: ${daily_profit:.2f})\n")
+            logger.info("  End of day balance: $%.2f (Daily P/L: $%.2f)\n", self.balance, daily_profit)
+        
+        # Trades closed per date, counted in one pass over the exit times
+        exit_days = self.trade_log.column('exit_time').astype('datetime64[D]')
+        trades_closed = np.bincount(np.searchsorted(unique_days, exit_days), minlength=len(dates))
+        
+        self.daily_equity = {
+            'date': unique_days[traded],
+            'weekday': WEEKDAY_NAMES[weekdays[traded]],
+            'balance': balances[traded],
+            'daily_profit': daily_profits[traded],
+            'trades_closed': trades_closed[traded]
+        }
         
         return self.generate_statistics()
     
     def generate_statistics(self) -> Dict:
         """Generate comprehensive statistics"""
-        if not self.closed_trades:
+        if not len(self.trade_log):
             return {'error': 'No trades executed'}
         
-        trades_df = pd.DataFrame([t.to_dict() for t in self.closed_trades])
+        trades_df = self.trade_log.to_dataframe()
+        # One vectorized datetime64 subtraction instead of a timedelta per trade
+        trades_df['duration'] = trades_df['exit_time'] - trades_df['entry_time']
         
-        # Basic statistics
-        total_trades = len(self.closed_trades)
-        winning_trades = len(trades_df[trades_df['profit'] > 0])
-        losing_trades = len(trades_df[trades_df['profit'] < 0])
-        breakeven_trades = len(trades_df[trades_df['profit'] == 0])
+        # Basic statistics - the sign masks are built once and shared by every aggregate below
+        profit = trades_df['profit'].to_numpy()
+        is_win = profit > 0
+        is_loss = profit < 0
+        total_trades = len(self.trade_log)
+        winning_trades = int(is_win.sum())
+        losing_trades = int(is_loss.sum())
+        breakeven_trades = total_trades - winning_trades - losing_trades
         
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
         
-        total_profit = trades_df['profit'].sum()
-        gross_profit = trades_df[trades_df['profit'] > 0]['profit'].sum()
-        gross_loss = abs(trades_df[trades_df['profit'] < 0]['profit'].sum())
+        total_profit = profit.sum()
+        gross_profit = profit[is_win].sum()
+        gross_loss = abs(profit[is_loss].sum())
         
-        avg_win = trades_df[trades_df['profit'] > 0]['profit'].mean() if winning_trades > 0 else 0
-        avg_loss = trades_df[trades_df['profit'] < 0]['profit'].mean() if losing_trades > 0 else 0
+        avg_win = profit[is_win].mean() if winning_trades > 0 else 0
+        avg_loss = profit[is_loss].mean() if losing_trades > 0 else 0
         
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
         
+        # Grouped analyses all aggregate this one (profit, win) frame with cython reductions
+        outcomes = pd.DataFrame({'profit': profit, 'win': is_win})
+        
         # Day of week analysis
-        trades_df['weekday'] = pd.to_datetime(trades_df['entry_time']).dt.day_name()
-        weekday_stats = trades_df.groupby('weekday')['profit'].agg([
-            ('total_profit', 'sum'),
-            ('avg_profit', 'mean'),
-            ('trade_count', 'count'),
-            ('win_rate', lambda x: (x > 0).sum() / len(x) * 100)
-        ]).round(2)
-        
-        # Reorder by weekday
-        weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-        weekday_stats = weekday_stats.reindex([d for d in weekday_order if d in weekday_stats.index])
-        
-        # Monthly analysis
-        trades_df['month'] = pd.to_datetime(trades_df['entry_time']).dt.to_period('M')
-        monthly_stats = trades_df.groupby('month')['profit'].agg([
-            ('total_profit', 'sum'),
-            ('trade_count', 'count')
-        ]).round(2)
-        
-        # Equity curve
-        equity_df = pd.DataFrame(self.daily_equity)
-        
-        # Drawdown analysis
-        equity_df['cumulative_max'] = equity_df['balance'].cummax()
-        equity_df['drawdown'] = equity_df['balance'] - equity_df['cumulative_max']
-        equity_df['drawdown_pct'] = (equity_df['drawdown'] / equity_df['cumulative_max'] * 100)
-        
-        max_drawdown = equity_df['drawdown'].min()
-        max_drawdown_pct = equity_df['drawdown_pct'].min()
+        weekday_codes = trades_df['entry_time'].dt.dayofweek
+        trades_df['weekday'] = WEEKDAY_NAMES[weekday_codes.to_numpy()]
+        weekday_stats = _profit_stats(outcomes, weekday_codes,
+                                      ('total_profit', 'avg_profit', 'trade_count', 'win_rate'))
+        
+        # Codes already sort Monday..Friday - drop weekends and name the rows
+        weekday_stats = weekday_stats[weekday_stats.index < SATURDAY]
+        weekday_stats.index = WEEKDAY_NAMES[weekday_stats.index.to_numpy()]
+        
+        # Best and worst weekday straight from the totals column (first one wins a tie)
+        day_totals = weekday_stats['total_profit']
+        best_day = (day_totals.idxmax(), day_totals.max()) if len(day_totals) else None
+        worst_day = (day_totals.idxmin(), day_totals.min()) if len(day_totals) else None
+        
+        # Monthly analysis ('YYYY-MM' labels sort chronologically)
+        trades_df['month'] = np.datetime_as_string(
+            trades_df['entry_time'].to_numpy().astype('datetime64[M]'), unit='M').astype(object)
+        monthly_stats = _profit_stats(outcomes, trades_df['month'], ('total_profit', 'trade_count'))
+        
+        # Drawdown analysis (plain NumPy over the daily balance array)
+        balance = self.daily_equity['balance']
+        cumulative_max = np.maximum.accumulate(balance)
+        drawdown = balance - cumulative_max
+        drawdown_pct = drawdown / cumulative_max * 100
+        
+        # Equity curve - the daily columns and their drawdown in one DataFrame build
+        equity_df = pd.DataFrame({**self.daily_equity, 'cumulative_max': cumulative_max,
+                                  'drawdown': drawdown, 'drawdown_pct': drawdown_pct})
+        
+        max_drawdown = drawdown.min()
+        max_drawdown_pct = drawdown_pct.min()
         
         # Session analysis
-        session_stats = trades_df.groupby('session')['profit'].agg([
-            ('total_profit', 'sum'),
-            ('avg_profit', 'mean'),
-            ('trade_count', 'count'),
-            ('win_rate', lambda x: (x > 0).sum() / len(x) * 100)
-        ]).round(2)
+        session_stats = _profit_stats(outcomes, self.trade_log.column('session'),
+                                      ('total_profit', 'avg_profit', 'trade_count', 'win_rate'),
+                                      SESSION_TYPES)
         
         # Trade type analysis
-        type_stats = trades_df.groupby('trade_type')['profit'].agg([
-            ('total_profit', 'sum'),
-            ('avg_profit', 'mean'),
-            ('trade_count', 'count')
-        ]).round(2)
+        type_stats = _profit_stats(outcomes, self.trade_log.column('trade_type'),
+                                   ('total_profit', 'avg_profit', 'trade_count'), TRADE_TYPES)
         
         # Exit reason analysis
-        exit_stats = trades_df.groupby('exit_reason')['profit'].agg([
-            ('total_profit', 'sum'),
-            ('trade_count', 'count')
-        ]).round(2)
+        exit_stats = _profit_stats(outcomes, self.trade_log.column('exit_reason'),
+                                   ('total_profit', 'trade_count'), EXIT_REASONS)
         
         # Session drawdown analysis
-        morning_max_dd = min(self.morning_session_drawdowns) if self.morning_session_drawdowns else 0
-        afternoon_max_dd = min(self.afternoon_session_drawdowns) if self.afternoon_session_drawdowns else 0
+        morning_dds = np.asarray(self.morning_session_drawdowns, dtype=np.float64)
+        afternoon_dds = np.asarray(self.afternoon_session_drawdowns, dtype=np.float64)
+        morning_max_dd = morning_dds.min() if morning_dds.size else 0
+        afternoon_max_dd = afternoon_dds.min() if afternoon_dds.size else 0
         overall_session_max_dd = min(morning_max_dd, afternoon_max_dd)
         
-        morning_avg_dd = sum(self.morning_session_drawdowns) / len(self.morning_session_drawdowns) if self.morning_session_drawdowns else 0
-        afternoon_avg_dd = sum(self.afternoon_session_drawdowns) / len(self.afternoon_session_drawdowns) if self.afternoon_session_drawdowns else 0
+        morning_avg_dd = morning_dds.mean() if morning_dds.size else 0
+        afternoon_avg_dd = afternoon_dds.mean() if afternoon_dds.size else 0
         
         # Calculate recommended starting balance (worst session * 3 for safety margin)
         recommended_balance = abs(overall_session_max_dd) * 3 if overall_session_max_dd < 0 else INITIAL_BALANCE
         safe_lot_multiplier = INITIAL_BALANCE / recommended_balance if recommended_balance > 0 else 1.0
         
-        # Convert Period objects to strings for JSON serialization
-        if 'month' in trades_df.columns:
-            trades_df['month'] = trades_df['month'].astype(str)
-        
         return {
             'summary': {
                 'initial_balance': INITIAL_BALANCE,
@@ -928,21 +1151,30 @@ class Backtester:
                 'afternoon_avg_session_dd': afternoon_avg_dd,
                 'worst_session_dd': overall_session_max_dd,
                 'recommended_starting_balance': recommended_balance,
-                'safe_lot_size': LOT_SIZE * safe_lot_multiplier,
+                'lot_size': self.lot_size,
+                'safe_lot_size': self.lot_size * safe_lot_multiplier,
             },
             'weekday_stats': weekday_stats.to_dict(),
+            'best_day': best_day,
+            'worst_day': worst_day,
             'monthly_stats': monthly_stats.to_dict(),
             'session_stats': session_stats.to_dict(),
             'trade_type_stats': type_stats.to_dict(),
             'exit_reason_stats': exit_stats.to_dict(),
-            'equity_curve': equity_df.to_dict('records'),
-            'all_trades': trades_df.to_dict('records')
+            'equity_curve': equity_df,
+            'all_trades': trades_df
         }
 
 # =============================================================================
 # REPORTING
 # =============================================================================
 
+# Report rules and table headers, formatted once at import
+REPORT_RULE = "=" * 80
+REPORT_THIN_RULE = "-" * 80
+DAY_TABLE_HEADER = f"{'Day':<12} {'Total Profit':<15} {'Avg Profit':<15} {'Trades':<10} {'Win Rate':<10}"
+SESSION_TABLE_HEADER = f"{'Session':<12} {'Total Profit':<15} {'Avg Profit':<15} {'Trades':<10} {'Win Rate':<10}"
+
 def print_report(stats: Dict):
     """Print comprehensive backtest report"""
     if 'error' in stats:
@@ -950,176 +1182,305 @@ def print_report(stats: Dict):
         return
     
     summary = stats['summary']
+    lines: List[str] = []
     
-    print("\n" + "=" * 80)
-    print(" " * 25 + "BACKTEST RESULTS")
-    print("=" * 80)
+    lines.append("\n" + REPORT_RULE)
+    lines.append(" " * 25 + "BACKTEST RESULTS")
+    lines.append(REPORT_RULE)
     
     # Summary
-    print("\n📊 SUMMARY")
-    print("-" * 80)
-    print(f"Initial Balance:        ${summary['initial_balance']:,.2f}")
-    print(f"Final Balance:          ${summary['final_balance']:,.2f}")
-    print(f"Total Profit/Loss:      ${summary['total_profit']:,.2f}")
-    print(f"Return:                 {summary['return_pct']:.2f}%")
-    print(f"Max Drawdown:           ${summary['max_drawdown']:,.2f} ({summary['max_drawdown_pct']:.2f}%)")
+    lines.append("\n📊 SUMMARY")
+    lines.append(REPORT_THIN_RULE)
+    lines.append(f"Initial Balance:        ${summary['initial_balance']:,.2f}")
+    lines.append(f"Final Balance:          ${summary['final_balance']:,.2f}")
+    lines.append(f"Total Profit/Loss:      ${summary['total_profit']:,.2f}")
+    lines.append(f"Return:                 {summary['return_pct']:.2f}%")
+    lines.append(f"Max Drawdown:           ${summary['max_drawdown']:,.2f} ({summary['max_drawdown_pct']:.2f}%)")
     
     # Trade Statistics
-    print("\n📈 TRADE STATISTICS")
-    print("-" * 80)
-    print(f"Total Trades:           {summary['total_trades']}")
-    print(f"Winning Trades:         {summary['winning_trades']} ({summary['win_rate']:.2f}%)")
-    print(f"Losing Trades:          {summary['losing_trades']}")
-    print(f"Breakeven Trades:       {summary['breakeven_trades']}")
-    print(f"Average Win:            ${summary['avg_win']:.2f}")
-    print(f"Average Loss:           ${summary['avg_loss']:.2f}")
-    print(f"Profit Factor:          {summary['profit_factor']:.2f}")
-    print(f"Gross Profit:           ${summary['gross_profit']:,.2f}")
-    print(f"Gross Loss:             ${summary['gross_loss']:,.2f}")
-    print(f"Average Pips/Trade:     {summary['avg_pips_per_trade']:.1f}")
+    lines.append("\n📈 TRADE STATISTICS")
+    lines.append(REPORT_THIN_RULE)
+    lines.append(f"Total Trades:           {summary['total_trades']}")
+    lines.append(f"Winning Trades:         {summary['winning_trades']} ({summary['win_rate']:.2f}%)")
+    lines.append(f"Losing Trades:          {summary['losing_trades']}")
+    lines.append(f"Breakeven Trades:       {summary['breakeven_trades']}")
+    lines.append(f"Average Win:            ${summary['avg_win']:.2f}")
+    lines.append(f"Average Loss:           ${summary['avg_loss']:.2f}")
+    lines.append(f"Profit Factor:          {summary['profit_factor']:.2f}")
+    lines.append(f"Gross Profit:           ${summary['gross_profit']:,.2f}")
+    lines.append(f"Gross Loss:             ${summary['gross_loss']:,.2f}")
+    lines.append(f"Average Pips/Trade:     {summary['avg_pips_per_trade']:.1f}")
     
     # Session Drawdown Analysis (RISK MANAGEMENT)
-    print("\n⚠️  SESSION DRAWDOWN ANALYSIS (RISK MANAGEMENT)")
-    print("=" * 80)
-    print(f"Morning Session:")
-    print(f"  Max Drawdown:         ${summary['morning_max_session_dd']:,.2f}")
-    print(f"  Avg Drawdown:         ${summary['morning_avg_session_dd']:,.2f}")
-    print(f"\nAfternoon Session:")
-    print(f"  Max Drawdown:         ${summary['afternoon_max_session_dd']:,.2f}")
-    print(f"  Avg Drawdown:         ${summary['afternoon_avg_session_dd']:,.2f}")
-    print(f"\n⚡ WORST SESSION DRAWDOWN: ${summary['worst_session_dd']:,.2f}")
-    print(f"\n💡 RECOMMENDED SETTINGS:")
-    print(f"  Minimum Starting Balance:  ${summary['recommended_starting_balance']:,.2f}")
-    print(f"  Safe Lot Size (current):   {LOT_SIZE}")
-    print(f"  OR use this lot size:      {summary['safe_lot_size']:.2f} (with ${INITIAL_BALANCE:,.2f})")
-    print("\nℹ️  The recommended balance gives you a 3x safety margin against")
-    print("   the worst session drawdown to avoid account wipeout.")
-    print("=" * 80)
+    lines.append("\n⚠️  SESSION DRAWDOWN ANALYSIS (RISK MANAGEMENT)")
+    lines.append(REPORT_RULE)
+    lines.append(f"Morning Session:")
+    lines.append(f"  Max Drawdown:         ${summary['morning_max_session_dd']:,.2f}")
+    lines.append(f"  Avg Drawdown:         ${summary['morning_avg_session_dd']:,.2f}")
+    lines.append(f"\nAfternoon Session:")
+    lines.append(f"  Max Drawdown:         ${summary['afternoon_max_session_dd']:,.2f}")
+    lines.append(f"  Avg Drawdown:         ${summary['afternoon_avg_session_dd']:,.2f}")
+    lines.append(f"\n⚡ WORST SESSION DRAWDOWN: ${summary['worst_session_dd']:,.2f}")
+    lines.append(f"\n💡 RECOMMENDED SETTINGS:")
+    lines.append(f"  Minimum Starting Balance:  ${summary['recommended_starting_balance']:,.2f}")
+    lines.append(f"  Safe Lot Size (current):   {summary['lot_size']}")
+    lines.append(f"  OR use this lot size:      {summary['safe_lot_size']:.2f} (with ${INITIAL_BALANCE:,.2f})")
+    lines.append("\nℹ️  The recommended balance gives you a 3x safety margin against")
+    lines.append("   the worst session drawdown to avoid account wipeout.")
+    lines.append(REPORT_RULE)
     
     # Day of Week Analysis
-    print("\n📅 DAY OF WEEK ANALYSIS")
-    print("-" * 80)
-    print(f"{'Day':<12} {'Total Profit':<15} {'Avg Profit':<15} {'Trades':<10} {'Win Rate':<10}")
-    print("-" * 80)
+    lines.append("\n📅 DAY OF WEEK ANALYSIS")
+    lines.append(REPORT_THIN_RULE)
+    lines.append(DAY_TABLE_HEADER)
+    lines.append(REPORT_THIN_RULE)
     
+    # Column dicts are bound once - the loops below only index them by key
     weekday_stats = stats['weekday_stats']
-    for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']:
-        if day in weekday_stats['total_profit']:
-            total = weekday_stats['total_profit'][day]
-            avg = weekday_stats['avg_profit'][day]
-            count = int(weekday_stats['trade_count'][day])
-            wr = weekday_stats['win_rate'][day]
-            
-            profit_color = "✅" if total > 0 else "❌"
-            print(f"{day:<12} {profit_color} ${total:<12,.2f} ${avg:<12,.2f} {count:<10} {wr:.1f}%")
+    day_totals, day_avgs = weekday_stats['total_profit'], weekday_stats['avg_profit']
+    day_counts, day_win_rates = weekday_stats['trade_count'], weekday_stats['win_rate']
+    # Rows already run Monday..Friday and only hold days that traded (see generate_statistics)
+    for day, total in day_totals.items():
+        avg = day_avgs[day]
+        count = int(day_counts[day])
+        wr = day_win_rates[day]
+        
+        profit_color = "✅" if total > 0 else "❌"
+        lines.append(f"{day:<12} {profit_color} ${total:<12,.2f} ${avg:<12,.2f} {count:<10} {wr:.1f}%")
     
-    # Best and Worst Days
-    best_day = max(weekday_stats['total_profit'].items(), key=lambda x: x[1])
-    worst_day = min(weekday_stats['total_profit'].items(), key=lambda x: x[1])
-    
-    print("\n🏆 BEST DAY TO TRADE:   " + best_day[0] + f" (${best_day[1]:,.2f})")
-    print("⚠️  WORST DAY TO TRADE:  " + worst_day[0] + f" (${worst_day[1]:,.2f})")
+    # Best and Worst Days (picked in generate_statistics)
+    best_day, worst_day = stats['best_day'], stats['worst_day']
+    if best_day:
+        lines.append("\n🏆 BEST DAY TO TRADE:   " + best_day[0] + f" (${best_day[1]:,.2f})")
+        lines.append("⚠️  WORST DAY TO TRADE:  " + worst_day[0] + f" (${worst_day[1]:,.2f})")
     
     # Session Analysis
-    print("\n🕐 SESSION ANALYSIS")
-    print("-" * 80)
-    print(f"{'Session':<12} {'Total Profit':<15} {'Avg Profit':<15} {'Trades':<10} {'Win Rate':<10}")
-    print("-" * 80)
+    lines.append("\n🕐 SESSION ANALYSIS")
+    lines.append(REPORT_THIN_RULE)
+    lines.append(SESSION_TABLE_HEADER)
+    lines.append(REPORT_THIN_RULE)
     
     session_stats = stats['session_stats']
-    for session in session_stats['total_profit']:
-        total = session_stats['total_profit'][session]
-        avg = session_stats['avg_profit'][session]
-        count = int(session_stats['trade_count'][session])
-        wr = session_stats['win_rate'][session]
-        
-        print(f"{session:<12} ${total:<14,.2f} ${avg:<14,.2f} {count:<10} {wr:.1f}%")
+    session_avgs, session_counts = session_stats['avg_profit'], session_stats['trade_count']
+    session_win_rates = session_stats['win_rate']
+    for session, total in session_stats['total_profit'].items():
+        avg = session_avgs[session]
+        count = int(session_counts[session])
+        wr = session_win_rates[session]
+        
+        lines.append(f"{session:<12} ${total:<14,.2f} ${avg:<14,.2f} {count:<10} {wr:.1f}%")
     
     # Trade Type Analysis
-    print("\n🎯 TRADE TYPE ANALYSIS")
-    print("-" * 80)
+    lines.append("\n🎯 TRADE TYPE ANALYSIS")
+    lines.append(REPORT_THIN_RULE)
     type_stats = stats['trade_type_stats']
-    for trade_type in type_stats['total_profit']:
-        total = type_stats['total_profit'][trade_type]
-        avg = type_stats['avg_profit'][trade_type]
-        count = int(type_stats['trade_count'][trade_type])
+    type_avgs, type_counts = type_stats['avg_profit'], type_stats['trade_count']
+    for trade_type, total in type_stats['total_profit'].items():
+        avg = type_avgs[trade_type]
+        count = int(type_counts[trade_type])
         
-        print(f"{trade_type:<15} Total: ${total:<10,.2f}  Avg: ${avg:<10,.2f}  Count: {count}")
+        lines.append(f"{trade_type:<15} Total: ${total:<10,.2f}  Avg: ${avg:<10,.2f}  Count: {count}")
     
     # Exit Reason Analysis
-    print("\n🚪 EXIT REASON ANALYSIS")
-    print("-" * 80)
+    lines.append("\n🚪 EXIT REASON ANALYSIS")
+    lines.append(REPORT_THIN_RULE)
     exit_stats = stats['exit_reason_stats']
-    for reason in exit_stats['total_profit']:
-        total = exit_stats['total_profit'][reason]
-        count = int(exit_stats['trade_count'][reason])
+    exit_counts = exit_stats['trade_count']
+    for reason, total in exit_stats['total_profit'].items():
+        count = int(exit_counts[reason])
         
-        print(f"{reason:<15} Total: ${total:<10,.2f}  Count: {count}")
+        lines.append(f"{reason:<15} Total: ${total:<10,.2f}  Count: {count}")
     
     # Monthly Performance
-    print("\n📆 MONTHLY PERFORMANCE")
-    print("-" * 80)
+    lines.append("\n📆 MONTHLY PERFORMANCE")
+    lines.append(REPORT_THIN_RULE)
     monthly_stats = stats['monthly_stats']
-    for month in monthly_stats['total_profit']:
-        profit = monthly_stats['total_profit'][month]
-        count = int(monthly_stats['trade_count'][month])
+    month_counts = monthly_stats['trade_count']
+    for month, profit in monthly_stats['total_profit'].items():
+        count = int(month_counts[month])
         
         profit_icon = "📈" if profit > 0 else "📉"
-        print(f"{profit_icon} {month}:  ${profit:,.2f}  ({count} trades)")
+        lines.append(f"{profit_icon} {month}:  ${profit:,.2f}  ({count} trades)")
     
-    print("\n" + "=" * 80 + "\n")
+    lines.append("\n" + REPORT_RULE + "\n")
+    
+    # One write for the whole report instead of a flush per line
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def write_frame(df: pd.DataFrame, filename: str, fmt: str = 'csv'):
+    """Write a results frame in one of OUTPUT_FORMATS"""
+    if fmt == 'feather':
+        df.to_feather(filename)
+    elif fmt == 'parquet':
+        df.to_parquet(filename, compression='zstd', index=False)
+    else:
+        df.to_csv(filename, index=False)
 
-def save_results(stats: Dict, filename: str):
-    """Save results to files"""
+def _json_safe(value):
+    """value with non-finite floats (e.g. profit_factor with no losing trades) as None"""
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+def save_results(stats: Dict, filename: str, fmt: str = 'csv'):
+    """Save results to files (trades and equity curve in fmt, summary as JSON)"""
     # Save summary to JSON
     json_filename = filename.replace('.csv', '_summary.json')
-    with open(json_filename, 'w') as f:
-        # Convert Period objects to strings in monthly_stats
-        monthly_stats_converted = {}
-        for key, value in stats['monthly_stats'].items():
-            monthly_stats_str = {str(k): v for k, v in value.items()}
-            monthly_stats_converted[key] = monthly_stats_str
-        
-        # Convert to JSON-serializable format
-        summary_export = {
-            'summary': stats['summary'],
-            'weekday_stats': stats['weekday_stats'],
-            'monthly_stats': monthly_stats_converted,
-            'session_stats': stats['session_stats'],
-            'trade_type_stats': stats['trade_type_stats'],
-            'exit_reason_stats': stats['exit_reason_stats']
-        }
-        json.dump(summary_export, f, indent=2, default=str)
-    
-    # Save trades to CSV
-    trades_df = pd.DataFrame(stats['all_trades'])
-    # Convert datetime and Period columns to strings for CSV
-    for col in trades_df.columns:
-        if pd.api.types.is_datetime64_any_dtype(trades_df[col]):
-            trades_df[col] = trades_df[col].astype(str)
-        elif hasattr(trades_df[col].dtype, 'name') and 'period' in trades_df[col].dtype.name.lower():
-            trades_df[col] = trades_df[col].astype(str)
-    trades_df.to_csv(filename, index=False)
+    summary_export = {
+        'summary': stats['summary'],
+        'weekday_stats': stats['weekday_stats'],
+        'monthly_stats': stats['monthly_stats'],
+        'session_stats': stats['session_stats'],
+        'trade_type_stats': stats['trade_type_stats'],
+        'exit_reason_stats': stats['exit_reason_stats']
+    }
+    # orjson writes inf/NaN as null and json as Infinity/NaN - write null either way
+    summary_export = _json_safe(summary_export)
+    if orjson is not None:
+        Path(json_filename).write_bytes(orjson.dumps(
+            summary_export, default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(json_filename, 'w') as f:
+            json.dump(summary_export, f, indent=2, default=str)
+    
+    # Save trades - to_csv's C writer formats the datetime64 columns itself, and the
+    # binary formats keep them typed
+    trades_filename = filename.replace('.csv', f'.{fmt}')
+    write_frame(stats['all_trades'], trades_filename, fmt)
     
     # Save equity curve
-    equity_filename = filename.replace('.csv', '_equity.csv')
-    equity_df = pd.DataFrame(stats['equity_curve'])
-    # Convert date columns to strings
-    for col in equity_df.columns:
-        if pd.api.types.is_datetime64_any_dtype(equity_df[col]) or col == 'date':
-            equity_df[col] = equity_df[col].astype(str)
-    equity_df.to_csv(equity_filename, index=False)
+    equity_filename = filename.replace('.csv', f'_equity.{fmt}')
+    write_frame(stats['equity_curve'], equity_filename, fmt)
     
     logger.info(f"\n💾 Results saved:")
-    logger.info(f"   - Trades: {filename}")
+    logger.info(f"   - Trades: {trades_filename}")
     logger.info(f"   - Summary: {json_filename}")
     logger.info(f"   - Equity: {equity_filename}")
 
+# =============================================================================
+# PARAMETER SWEEP
+# =============================================================================
+
+def share_bars(df: pd.DataFrame, directory: str, symbol: str):
+    """Write fetched bars to an uncompressed Feather file the workers memory-map (needs pyarrow)"""
+    path = str(Path(directory) / f"{symbol}.feather")
+    try:
+        df.to_feather(path, compression='uncompressed')
+    except ImportError:
+        # No pyarrow - the frame itself is pickled into every job instead
+        return df
+    return path
+
+def load_shared_bars(bars) -> pd.DataFrame:
+    """Bars handed to a sweep job - a Feather path from share_bars, or the frame itself"""
+    if isinstance(bars, str):
+        from pyarrow import feather
+        return feather.read_table(bars, memory_map=True).to_pandas()
+    return bars
+
+def _run_sweep_job(job: Tuple) -> Tuple[str, float, Dict]:
+    """Run one (symbol, TP_UNITS) variant of a sweep on already-fetched bars (worker process)"""
+    global TP_UNITS
+    bars, symbol, start_date, end_date, point, digits, lot_size, tp_units = job
+    TP_UNITS = tp_units
+    
+    # Day-by-day logs from several workers would interleave - keep warnings only
+    logging.getLogger().setLevel(logging.WARNING)
+    # The pool already uses every core, so each worker runs its day kernel single-threaded
+    set_num_threads(1)
+    
+    backtester = Backtester(symbol, start_date, end_date, lot_size)
+    backtester.set_symbol_info(point, digits)
+    return symbol, tp_units, backtester.run(load_shared_bars(bars))
+
+def warm_up_kernels(df: pd.DataFrame, point: float):
+    """Compile (or load from numba's disk cache) the day kernel for df's column types on empty inputs"""
+    bars = {col: df[col].to_numpy()[:0] for col in ('high', 'low', 'close', 'minute_of_day')}
+    no_days = np.zeros(0, dtype=np.int64)
+    no_sessions = np.zeros((2, 0))
+    _simulate_days(bars['high'], bars['low'], bars['close'], bars['minute_of_day'], no_days, no_days,
+                   np.zeros((2, 0), dtype=np.int64), np.zeros((2, 0), dtype=np.bool_), no_sessions,
+                   no_sessions, point, TP_UNITS, LOT_SIZE, SCALE_LEVELS, REVERSAL_SCALE_LEVELS)
+
+def run_sweep(backtesters: List[Backtester], tp_values: List[float],
+              jobs: Optional[int] = None) -> List[Tuple[str, float, Dict]]:
+    """Backtest every symbol x TP_UNITS combination in parallel processes, one data fetch per symbol"""
+    with tempfile.TemporaryDirectory(prefix='backtest_sweep_') as shared_dir:
+        # Bars are fetched here since only the parent process holds the MT5 connection, and
+        # written once per symbol so jobs carry a file path rather than a pickled frame
+        job_args = []
+        for backtester in backtesters:
+            df = backtester.get_historical_data()
+            if df is None:
+                logger.error(f"No data for {backtester.symbol} - left out of the sweep")
+                continue
+            bars = share_bars(df, shared_dir, backtester.symbol)
+            job_args.extend((bars, backtester.symbol, backtester.start_date, backtester.end_date,
+                             backtester.point, backtester.digits, backtester.lot_size, tp_units)
+                            for tp_units in tp_values)
+        
+        if not job_args:
+            return []
+        
+        # Compile once here, on bars loaded the way the workers load them, so the workers
+        # all load the kernels from the on-disk cache instead of each compiling them
+        warm_up_kernels(load_shared_bars(job_args[0][0]), job_args[0][4])
+        
+        logger.info(f"Running {len(job_args)} sweep backtests in parallel...")
+        # Spawned, not forked: the warm-up may have started numba's thread pool, which a forked
+        # child would inherit in a broken state
+        with multiprocessing.get_context('spawn').Pool(processes=jobs) as pool:
+            return pool.map(_run_sweep_job, job_args)
+
+def print_sweep_report(results: List[Tuple[str, float, Dict]]):
+    """Print a one-line summary per sweep variant"""
+    print("\n" + "=" * 90)
+    print(" " * 35 + "SWEEP RESULTS")
+    print("=" * 90)
+    print(f"{'Symbol':<10} {'TP Units':<10} {'Trades':<8} {'Win Rate':<10} {'Total Profit':<15} "
+          f"{'Max DD':<14} {'Worst Session DD'}")
+    print("-" * 90)
+    
+    for symbol, tp_units, stats in results:
+        if 'error' in stats:
+            print(f"{symbol:<10} {tp_units:<10g} ❌ {stats['error']}")
+            continue
+        
+        summary = stats['summary']
+        win_rate = f"{summary['win_rate']:.1f}%"
+        print(f"{symbol:<10} {tp_units:<10g} {summary['total_trades']:<8} {win_rate:<10} "
+              f"${summary['total_profit']:<14,.2f} ${summary['max_drawdown']:<13,.2f} "
+              f"${summary['worst_session_dd']:,.2f}")
+    
+    print("=" * 90 + "\n")
+
 # =============================================================================
 # MAIN
 # =============================================================================
 
-def main():
+def run_backtest(start_date: datetime, end_date: datetime, symbol: str = SYMBOL,
+                 lot_size: float = LOT_SIZE, output: Optional[str] = None, fmt: str = 'csv',
+                 use_cache: bool = True) -> Optional[Dict]:
+    """Run one backtest without going through the command line (for scripted sweeps)"""
+    backtester = Backtester(symbol, start_date, end_date, lot_size)
+    if not use_cache:
+        backtester.cache_dir = None
+    
+    try:
+        if not backtester.initialize():
+            return None
+        
+        stats = backtester.run()
+        if stats and output:
+            save_results(stats, output, fmt)
+        return stats
+    finally:
+        mt5.shutdown()
+
+def main(argv: Optional[List[str]] = None):
     # Declare globals at the start
     global SYMBOL, LOT_SIZE
     
@@ -1129,16 +1490,25 @@ def main():
     parser.add_argument('--end', type=str, required=True,
                        help='End date (YYYY-MM-DD)')
     parser.add_argument('--symbol', type=str, default=SYMBOL,
-                       help=f'Trading symbol (default: {SYMBOL})')
+                       help=f'Trading symbol, or comma-separated symbols to backtest in parallel (default: {SYMBOL})')
     parser.add_argument('--lot-size', type=float, default=LOT_SIZE,
                        help=f'Lot size (default: {LOT_SIZE})')
     parser.add_argument('--output', type=str, default='backtest_results.csv',
                        help='Output CSV filename')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv',
+                       help='File format for the trades and equity curve (default: csv)')
+    parser.add_argument('--sweep-tp', type=str, default=None,
+                       help='Comma-separated TP units to backtest in parallel (e.g. 250,300,350)')
+    parser.add_argument('--jobs', type=int, default=None,
+                       help='Worker processes for --sweep-tp / several symbols (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help=f'Always fetch bars from MT5 instead of the {DATA_CACHE_DIR}/ Parquet cache')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Update global settings
-    SYMBOL = args.symbol
+    symbols = [symbol.strip() for symbol in args.symbol.split(',') if symbol.strip()]
+    SYMBOL = symbols[0]
     LOT_SIZE = args.lot_size
     
     # Parse dates
@@ -1149,19 +1519,38 @@ def main():
         print("❌ Error: Invalid date format. Use YYYY-MM-DD")
         return
     
-    # Initialize and run backtest
-    backtester = Backtester(SYMBOL, start_date, end_date)
+    tp_values = None
+    if args.sweep_tp:
+        try:
+            tp_values = [float(value) for value in args.sweep_tp.split(',')]
+        except ValueError:
+            print("❌ Error: Invalid --sweep-tp list. Use comma-separated numbers, e.g. 250,300,350")
+            return
     
-    if not backtester.initialize():
-        print("❌ Failed to initialize backtester")
-        return
+    # Initialize and run backtest (one backtester per symbol)
+    backtesters = [Backtester(symbol, start_date, end_date) for symbol in symbols]
+    for backtester in backtesters:
+        if args.no_cache:
+            backtester.cache_dir = None
+        
+        if not backtester.initialize():
+            print("❌ Failed to initialize backtester")
+            return
     
     try:
-        stats = backtester.run()
-        
-        if stats:
-            print_report(stats)
-            save_results(stats, args.output)
+        if tp_values or len(backtesters) > 1:
+            results = run_sweep(backtesters, tp_values or [TP_UNITS], args.jobs)
+            print_sweep_report(results)
+            for symbol, tp_units, stats in results:
+                if 'error' not in stats:
+                    suffix = f'_tp{tp_units:g}.csv' if len(backtesters) == 1 else f'_{symbol}_tp{tp_units:g}.csv'
+                    save_results(stats, args.output.replace('.csv', suffix), args.format)
+        else:
+            stats = backtesters[0].run()
+            
+            if stats:
+                print_report(stats)
+                save_results(stats, args.output, args.format)
     
     except KeyboardInterrupt:
         print("\n\n⚠️  Backtest interrupted by user")
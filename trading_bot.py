@@ -5,10 +5,10 @@ Production-ready implementation with vectorized operations
 
 import MetaTrader5 as mt5
 import numpy as np
-import pandas as pd
 from datetime import datetime, time, timedelta
 import logging
-from typing import Tuple, Optional, Dict, List
+from functools import lru_cache
+from typing import Tuple, Optional, Dict, List, NamedTuple, Set
 import time as time_module
 
 # =============================================================================
@@ -44,7 +44,11 @@ SCALE_LEVELS = [0.75, 0.50, 0.25]  # 75%, 50%, 25% retracement levels
 
 # Bot Settings
 TIMEFRAME = mt5.TIMEFRAME_M5  # 5-minute candles
+TIMEFRAME_SECONDS = 5 * 60  # Length of one TIMEFRAME candle
+CANDLE_FETCH_MARGIN = 12  # Extra candles fetched beyond what the session steps need
 POLL_INTERVAL = 1  # Seconds between checks
+MIN_POLL_INTERVAL = 0.1  # Shortest sleep when an event boundary is imminent
+TICK_CACHE_TTL = 0.05  # Seconds a fetched tick is reused for pricing orders
 MAX_SLIPPAGE = 2  # Maximum slippage in points
 
 # Logging Configuration
@@ -80,12 +84,13 @@ class TradingState:
         self.afternoon_reversal_count: int = 0
         self.morning_scale_levels: List[float] = []
         self.afternoon_scale_levels: List[float] = []
-        self.morning_positions: List[int] = []  # Ticket numbers
-        self.afternoon_positions: List[int] = []
+        self.morning_positions: Set[int] = set()  # Ticket numbers
+        self.afternoon_positions: Set[int] = set()
         self.morning_initial_breakout_done: bool = False  # Track if initial breakout happened
         self.afternoon_initial_breakout_done: bool = False
-        self.morning_breakout_candle_time: Optional[pd.Timestamp] = None  # Track when breakout candle closed
-        self.afternoon_breakout_candle_time: Optional[pd.Timestamp] = None
+        self.morning_breakout_candle_time: Optional[int] = None  # Track when breakout candle closed
+        self.afternoon_breakout_candle_time: Optional[int] = None
+        self.last_completed_candle_time: Optional[int] = None  # As of the previous loop iteration
         
     def reset_morning(self):
         """Reset morning session state"""
@@ -93,7 +98,7 @@ class TradingState:
         self.morning_breakout = None
         self.morning_reversal_count = 0
         self.morning_scale_levels = []
-        self.morning_positions = []
+        self.morning_positions = set()
         self.morning_initial_breakout_done = False
         self.morning_breakout_candle_time = None
         
@@ -103,7 +108,7 @@ class TradingState:
         self.afternoon_breakout = None
         self.afternoon_reversal_count = 0
         self.afternoon_scale_levels = []
-        self.afternoon_positions = []
+        self.afternoon_positions = set()
         self.afternoon_initial_breakout_done = False
         self.afternoon_breakout_candle_time = None
 
@@ -113,8 +118,15 @@ state = TradingState()
 # MT5 CONNECTION AND INITIALIZATION
 # =============================================================================
 
+# Symbol metadata is static for a connection - fetched once by get_symbol_info
+# and dropped whenever the connection is (re)initialized
+_symbol_info_cache: Optional[Dict] = None
+
 def initialize_mt5() -> bool:
     """Initialize MetaTrader5 connection"""
+    global _symbol_info_cache
+    _symbol_info_cache = None
+    
     if not mt5.initialize():
         logger.error(f"MT5 initialization failed: {mt5.last_error()}")
         return False
@@ -169,11 +181,46 @@ def get_candles(symbol: str, timeframe: int, count: int = 100) -> Optional[np.nd
         logger.error(f"Error retrieving candles: {e}")
         return None
 
-def candles_to_dataframe(candles: np.ndarray) -> pd.DataFrame:
-    """Convert candles to pandas DataFrame for analysis"""
-    df = pd.DataFrame(candles)
-    df['time'] = pd.to_datetime(df['time'], unit='s')
-    return df
+class Candle(NamedTuple):
+    """A single candle's fields as plain Python scalars"""
+    time: int
+    open: float
+    high: float
+    low: float
+    close: float
+
+def latest_candle_tuple(candles: np.ndarray, index: int = -1) -> Optional[Candle]:
+    """
+    Read one candle out of the structured array as a Candle
+    
+    Args:
+        candles: Numpy array of OHLC data
+        index: Position of the candle (-1 = forming candle, -2 = last completed)
+        
+    Returns:
+        Candle, or None if the array is too short to have that candle
+    """
+    if len(candles) < -index:
+        return None
+    candle = candles[index]
+    return Candle(int(candle['time']), float(candle['open']), float(candle['high']),
+                  float(candle['low']), float(candle['close']))
+
+# Candle 'time' fields are seconds since this (naive, broker-time) epoch
+CANDLE_EPOCH = datetime(1970, 1, 1)
+
+def to_candle_time(dt: datetime) -> int:
+    """Convert a naive broker-time datetime to the candles' epoch-seconds time"""
+    return int((dt - CANDLE_EPOCH).total_seconds())
+
+def _fmt_ts(ts: int) -> str:
+    """Format a candle epoch-seconds time for logging"""
+    return str(CANDLE_EPOCH + timedelta(seconds=int(ts)))
+
+@lru_cache(maxsize=16)
+def session_candle_time(current_date: datetime.date, t: time) -> int:
+    """Candle time of config (VM) time t on current_date in broker time - cached, a few per day"""
+    return to_candle_time(datetime.combine(current_date, t) + timedelta(hours=TIMEZONE_OFFSET_HOURS))
 
 # =============================================================================
 # RANGE CALCULATION
@@ -194,34 +241,33 @@ def get_range(candles: np.ndarray, start_time: time, end_time: time,
         Dictionary with 'high', 'low', 'time_start', 'time_end' or None
     """
     try:
-        df = candles_to_dataframe(candles)
-        
         # Create datetime objects for filtering
         # Adjust for timezone offset - candles are in broker time
         start_dt = datetime.combine(current_date, start_time) + timedelta(hours=TIMEZONE_OFFSET_HOURS)
         end_dt = datetime.combine(current_date, end_time) + timedelta(hours=TIMEZONE_OFFSET_HOURS)
         
-        # Filter candles in range window (vectorized)
-        mask = (df['time'] >= start_dt) & (df['time'] < end_dt)
-        range_candles = df[mask]
+        # Candles are sorted by time - find the window with two binary searches on the
+        # raw array instead of building a DataFrame and masking it
+        start, end = np.searchsorted(candles['time'], (to_candle_time(start_dt), to_candle_time(end_dt)))
+        candle_count = int(end - start)
         
-        if len(range_candles) < 3:
-            logger.warning(f"Insufficient candles for range: {len(range_candles)}")
+        if candle_count < 3:
+            logger.warning(f"Insufficient candles for range: {candle_count}")
             return None
         
-        # Vectorized high/low calculation
-        range_high = range_candles['high'].max()
-        range_low = range_candles['low'].min()
+        # Vectorized high/low calculation over the window slice
+        range_high = candles['high'][start:end].max()
+        range_low = candles['low'][start:end].min()
         
         range_info = {
             'high': range_high,
             'low': range_low,
             'time_start': start_dt,
             'time_end': end_dt,
-            'candles': len(range_candles)
+            'candles': candle_count
         }
         
-        logger.info(f"Range calculated: High={range_high:.5f}, Low={range_low:.5f}, Candles={len(range_candles)}")
+        logger.info(f"Range calculated: High={range_high:.5f}, Low={range_low:.5f}, Candles={candle_count}")
         return range_info
         
     except Exception as e:
@@ -244,87 +290,65 @@ def check_breakout(candles: np.ndarray, range_info: Dict,
         current_date: Current trading date
         
     Returns:
-        Dictionary with 'direction', 'price', 'time' or None
+        Dictionary with 'direction', 'price', 'time' (candle epoch seconds) or None
     """
-    try:
-        df = candles_to_dataframe(candles)
-        
-        # IMPORTANT: Exclude the last candle (currently forming) in live trading
-        # The last candle's "close" is actually the current price, not a closed candle!
-        # We only want to check COMPLETED candles that have actually closed
-        if len(df) > 1:
-            df = df.iloc[:-1]  # Remove last (current) candle
-        
-        # Filter candles after entry start time
-        # Adjust for timezone offset - candles are in broker time
-        entry_dt = datetime.combine(current_date, entry_start_time) + timedelta(hours=TIMEZONE_OFFSET_HOURS)
-        logger.debug(f"check_breakout: current_date={current_date}, entry_start_time={entry_start_time}, entry_dt={entry_dt}, OFFSET={TIMEZONE_OFFSET_HOURS}h")
-        mask = df['time'] >= entry_dt
-        entry_candles = df[mask]
-        logger.debug(f"check_breakout: Found {len(entry_candles)} COMPLETED candles after entry_dt")
-        
-        if len(entry_candles) == 0:
-            return None
-        
-        range_high = range_info['high']
-        range_low = range_info['low']
-        
-        # Vectorized breakout detection  
-        # Buy breakout: CLOSED candle above range high
-        buy_breakout_mask = entry_candles['close'] > range_high
-        # Sell breakout: CLOSED candle below range low
-        sell_breakout_mask = entry_candles['close'] < range_low
-        
-        # Find first breakout
-        buy_breakouts = entry_candles[buy_breakout_mask]
-        sell_breakouts = entry_candles[sell_breakout_mask]
-        
-        first_buy = buy_breakouts.iloc[0] if len(buy_breakouts) > 0 else None
-        first_sell = sell_breakouts.iloc[0] if len(sell_breakouts) > 0 else None
-        
-        # Determine which came first
-        if first_buy is not None and first_sell is not None:
-            if first_buy['time'] < first_sell['time']:
-                direction = 'BUY'
-                breakout_candle = first_buy
-            else:
-                direction = 'SELL'
-                breakout_candle = first_sell
-        elif first_buy is not None:
-            direction = 'BUY'
-            breakout_candle = first_buy
-        elif first_sell is not None:
-            direction = 'SELL'
-            breakout_candle = first_sell
-        else:
-            return None
-        
-        breakout_info = {
-            'direction': direction,
-            'price': float(breakout_candle['close']),
-            'time': breakout_candle['time'],
-            'candle_high': float(breakout_candle['high']),
-            'candle_low': float(breakout_candle['low'])
-        }
-        
-        logger.info(f"Breakout detected: {direction} at {breakout_info['price']:.5f} @ {breakout_candle['time']}")
-        return breakout_info
-        
-    except Exception as e:
-        logger.error(f"Error checking breakout: {e}")
+    # IMPORTANT: Exclude the last candle (currently forming) in live trading
+    # The last candle's "close" is actually the current price, not a closed candle!
+    # We only want to check COMPLETED candles that have actually closed
+    if len(candles) > 1:
+        candles = candles[:-1]  # Remove last (current) candle
+    
+    # Filter candles after entry start time
+    # Adjust for timezone offset - candles are in broker time
+    entry_ts = session_candle_time(current_date, entry_start_time)
+    logger.debug(f"check_breakout: current_date={current_date}, entry_start_time={entry_start_time}, entry_ts={entry_ts}, OFFSET={TIMEZONE_OFFSET_HOURS}h")
+    # Candles are sorted by time, so the entry candles are a tail slice of the raw array
+    entry_candles = candles[np.searchsorted(candles['time'], entry_ts):]
+    logger.debug(f"check_breakout: Found {len(entry_candles)} COMPLETED candles after entry_dt")
+    
+    if len(entry_candles) == 0:
         return None
+    
+    range_high = range_info['high']
+    range_low = range_info['low']
+    
+    # Vectorized breakout detection - a CLOSED candle above range high (BUY) or
+    # below range low (SELL); the first such candle in time order wins
+    closes = entry_candles['close']
+    breakout_mask = (closes > range_high) | (closes < range_low)
+    if not breakout_mask.any():
+        return None
+    
+    breakout_candle = entry_candles[breakout_mask.argmax()]
+    direction = 'BUY' if breakout_candle['close'] > range_high else 'SELL'
+    breakout_time = int(breakout_candle['time'])
+    
+    breakout_info = {
+        'direction': direction,
+        'price': float(breakout_candle['close']),
+        'time': breakout_time,
+        'candle_high': float(breakout_candle['high']),
+        'candle_low': float(breakout_candle['low'])
+    }
+    
+    logger.info(f"Breakout detected: {direction} at {breakout_info['price']:.5f} @ {_fmt_ts(breakout_time)}")
+    return breakout_info
 
 # =============================================================================
 # POSITION MANAGEMENT
 # =============================================================================
 
 def get_symbol_info() -> Optional[Dict]:
-    """Get symbol trading information"""
+    """Get symbol trading information (cached until MT5 is reinitialized)"""
+    global _symbol_info_cache
+    if _symbol_info_cache is not None:
+        return _symbol_info_cache
+    
     info = mt5.symbol_info(SYMBOL)
     if info is None:
         return None
     
-    return {
+    _symbol_info_cache = {
         'point': info.point,
         'digits': info.digits,
         'trade_contract_size': info.trade_contract_size,
@@ -332,6 +356,23 @@ def get_symbol_info() -> Optional[Dict]:
         'volume_max': info.volume_max,
         'volume_step': info.volume_step
     }
+    return _symbol_info_cache
+
+# Latest tick and when it was fetched (time.monotonic) - lets the orders sent in
+# one loop iteration price off a single symbol_info_tick round-trip
+_tick_cache = {'ts': 0.0, 'tick': None}
+
+def get_tick():
+    """Get the current tick for SYMBOL, reusing one fetched within TICK_CACHE_TTL"""
+    now = time_module.monotonic()
+    if _tick_cache['tick'] is not None and now - _tick_cache['ts'] < TICK_CACHE_TTL:
+        return _tick_cache['tick']
+    
+    tick = mt5.symbol_info_tick(SYMBOL)
+    if tick is not None:
+        _tick_cache['ts'] = now
+        _tick_cache['tick'] = tick
+    return tick
 
 def open_position(direction: str, lot_size: float, tp_price: float, 
                   comment: str = "") -> Optional[int]:
@@ -356,10 +397,10 @@ def open_position(direction: str, lot_size: float, tp_price: float,
         # Determine order type and price
         if direction == 'BUY':
             order_type = mt5.ORDER_TYPE_BUY
-            price = mt5.symbol_info_tick(SYMBOL).ask
+            price = get_tick().ask
         else:
             order_type = mt5.ORDER_TYPE_SELL
-            price = mt5.symbol_info_tick(SYMBOL).bid
+            price = get_tick().bid
         
         if price is None:
             logger.error("Failed to get current price")
@@ -398,32 +439,39 @@ def open_position(direction: str, lot_size: float, tp_price: float,
         logger.error(f"Error opening position: {e}")
         return None
 
-def close_position(ticket: int) -> bool:
+def close_position(ticket: int, position=None, tick=None) -> bool:
     """
     Close a specific position by ticket
     
     Args:
         ticket: Position ticket number
+        position: Position object already fetched from mt5.positions_get;
+            looked up by ticket when omitted
+        tick: Tick snapshot to price the close from; fetched when omitted
         
     Returns:
         True if closed successfully, False otherwise
     """
     try:
         # Get position info
-        position = mt5.positions_get(ticket=ticket)
-        if position is None or len(position) == 0:
-            logger.warning(f"Position {ticket} not found")
-            return False
+        if position is None:
+            position = mt5.positions_get(ticket=ticket)
+            if position is None or len(position) == 0:
+                logger.warning(f"Position {ticket} not found")
+                return False
+            
+            position = position[0]
         
-        position = position[0]
+        if tick is None:
+            tick = get_tick()
         
         # Determine close parameters
         if position.type == mt5.ORDER_TYPE_BUY:
             order_type = mt5.ORDER_TYPE_SELL
-            price = mt5.symbol_info_tick(SYMBOL).bid
+            price = tick.bid
         else:
             order_type = mt5.ORDER_TYPE_BUY
-            price = mt5.symbol_info_tick(SYMBOL).ask
+            price = tick.ask
         
         if price is None:
             logger.error("Failed to get closing price")
@@ -472,7 +520,7 @@ def close_all_positions(session: str = "ALL") -> int:
         if positions is None or len(positions) == 0:
             return 0
         
-        closed_count = 0
+        to_close = []
         
         for position in positions:
             if position.magic != MAGIC_NUMBER:
@@ -484,8 +532,11 @@ def close_all_positions(session: str = "ALL") -> int:
             if session == "AFTERNOON" and position.ticket not in state.afternoon_positions:
                 continue
             
-            if close_position(position.ticket):
-                closed_count += 1
+            to_close.append(position)
+        
+        # One tick snapshot prices every close
+        tick = get_tick() if to_close else None
+        closed_count = sum(close_position(position.ticket, position, tick) for position in to_close)
         
         logger.info(f"Closed {closed_count} {session} positions")
         return closed_count
@@ -498,6 +549,10 @@ def close_all_positions(session: str = "ALL") -> int:
 # SCALING LOGIC
 # =============================================================================
 
+# The only two shapes calculate_scale_levels ever uses - built once at import
+_SCALE_PCT_INITIAL = np.asarray(SCALE_LEVELS, dtype=np.float64)
+_SCALE_PCT_REVERSAL = np.array([0.50])
+
 def calculate_scale_levels(range_info: Dict, direction: str, is_reversal: bool = False) -> List[float]:
     """
     Calculate scaling entry prices using vectorized operations
@@ -517,9 +572,9 @@ def calculate_scale_levels(range_info: Dict, direction: str, is_reversal: bool =
     # For reversal trades, only scale at 50%
     # For initial breakout, scale at 75%, 50%, 25%
     if is_reversal:
-        percentages = np.array([0.50])  # Only 50% level on reversal
+        percentages = _SCALE_PCT_REVERSAL  # Only 50% level on reversal
     else:
-        percentages = np.array(SCALE_LEVELS)  # All levels on initial breakout
+        percentages = _SCALE_PCT_INITIAL  # All levels on initial breakout
     
     if direction == 'BUY':
         # For buy, scale levels are below range high going down
@@ -530,18 +585,21 @@ def calculate_scale_levels(range_info: Dict, direction: str, is_reversal: bool =
     
     return levels.tolist()
 
-def check_and_execute_scaling(candles: np.ndarray, range_info: Dict, 
-                               breakout_info: Dict, scale_levels: List[float],
-                               session: str) -> List[float]:
+def check_and_execute_scaling(latest: Candle, last_completed: Optional[Candle],
+                               range_info: Dict, breakout_info: Dict,
+                               scale_levels: List[float], session: str,
+                               now: Optional[datetime] = None) -> List[float]:
     """
     Check if price has hit any scale levels and execute entries
     
     Args:
-        candles: Numpy array of OHLC data
+        latest: Currently forming candle
+        last_completed: Most recent completed candle (None if there is none)
         range_info: Range information
         breakout_info: Breakout information
         scale_levels: List of remaining scale levels to check
         session: 'MORNING' or 'AFTERNOON'
+        now: VM time of this poll (default: datetime.now())
         
     Returns:
         Updated list of remaining scale levels
@@ -559,10 +617,8 @@ def check_and_execute_scaling(candles: np.ndarray, range_info: Dict,
         # Only check scales if we have candles AFTER the breakout candle
         # This ensures scaling only starts on NEW candles, not the same candle that triggered breakout
         if breakout_candle_time is not None:
-            df = pd.DataFrame(candles)
-            df = df.iloc[:-1]  # Exclude the currently forming candle
-            if not df.empty:
-                last_completed_candle_time = df.iloc[-1]['time']
+            if last_completed is not None:
+                last_completed_candle_time = last_completed.time
                 if last_completed_candle_time <= breakout_candle_time:
                     # We're still on the same or earlier candle as the breakout - don't check scales yet
                     logger.debug(f"{session}: Waiting for new candle after breakout (breakout: {breakout_candle_time}, current: {last_completed_candle_time})")
@@ -570,11 +626,22 @@ def check_and_execute_scaling(candles: np.ndarray, range_info: Dict,
         
         # Get latest candle (FORMING candle - we want to monitor touches in real-time)
         # For scaling, we check the high/low of the CURRENT forming candle
-        latest_candle = candles[-1]
-        candle_high = latest_candle['high']
-        candle_low = latest_candle['low']
+        candle_high = latest.high
+        candle_low = latest.low
         direction = breakout_info['direction']
         
+        # Test every remaining level against the candle in one comparison
+        # For buy, trigger when candle LOW touches or goes below the level
+        # For sell, trigger when candle HIGH touches or goes above the level
+        levels = np.asarray(scale_levels, dtype=float)
+        if direction == 'BUY':
+            triggered = candle_low <= levels
+        else:
+            triggered = candle_high >= levels
+        
+        if not triggered.any():
+            return scale_levels
+        
         # Calculate TP
         tp_price = calculate_tp(breakout_info)
         
@@ -585,79 +652,61 @@ def check_and_execute_scaling(candles: np.ndarray, range_info: Dict,
             is_reversal_trade = state.afternoon_reversal_count >= 1
         
         # Get the full original scale levels to determine index
-        range_high = range_info['high']
-        range_low = range_info['low']
-        if is_reversal_trade:
-            # Reversal has only 50% level
-            full_scale_levels = calculate_scale_levels(range_info, direction, is_reversal=True)
-        else:
-            # Initial breakout has 75%, 50%, 25%
-            full_scale_levels = calculate_scale_levels(range_info, direction, is_reversal=False)
+        # Reversal has only 50% level, initial breakout has 75%, 50%, 25%
+        full_scale_levels = np.asarray(
+            calculate_scale_levels(range_info, direction, is_reversal=is_reversal_trade)
+        )
         
-        # Check each scale level (vectorized)
-        remaining_levels = []
+        # Untriggered levels stay armed, as do triggered ones outside the entry window
+        keep = ~triggered
         
-        for level in scale_levels:
-            triggered = False
+        for i in np.flatnonzero(triggered):
+            level = scale_levels[i]
+            
+            # Check if still within entry window for this session
+            if session == "MORNING":
+                if not can_enter_morning_trade(now):
+                    logger.info(f"Morning: Scale level {level:.5f} triggered but past entry cutoff - skipping")
+                    keep[i] = True
+                    continue
+            elif session == "AFTERNOON":
+                if not can_enter_afternoon_trade(now):
+                    logger.info(f"Afternoon: Scale level {level:.5f} triggered but past exit time - skipping")
+                    keep[i] = True
+                    continue
+            # Determine lot size based on scale order
+            # Find the index of this level in the full original list
+            matches = np.flatnonzero(full_scale_levels == level)
+            level_index = int(matches[0]) if matches.size else 0  # Fallback
             
-            if direction == 'BUY':
-                # For buy, trigger when candle LOW touches or goes below the level
-                if candle_low <= level:
-                    triggered = True
+            if is_reversal_trade:
+                # For reversal: only 1 scale (50%) with 4x lot size
+                lot_size = LOT_SIZE * 8
             else:
-                # For sell, trigger when candle HIGH touches or goes above the level
-                if candle_high >= level:
-                    triggered = True
+                # For initial breakout - lot sizing based on which level is hit first (closest to breakout)
+                # The level closest to breakout gets smallest lot (2x), deepest gets largest (4x)
+                # BUY levels: [12.5, 15, 17.5] - hit order: 17.5(2x), 15(3x), 12.5(4x)
+                # SELL levels: [17.5, 15, 12.5] - hit order: 12.5(2x), 15(3x), 17.5(4x)
+                # Both use same formula: deepest in list gets most lot size
+                lot_size = LOT_SIZE * (4 - level_index)  # 0->4x, 1->3x, 2->2x
             
-            if triggered:
-                # Check if still within entry window for this session
-                if session == "MORNING":
-                    if not can_enter_morning_trade():
-                        logger.info(f"Morning: Scale level {level:.5f} triggered but past entry cutoff - skipping")
-                        remaining_levels.append(level)
-                        continue
-                elif session == "AFTERNOON":
-                    if not can_enter_afternoon_trade():
-                        logger.info(f"Afternoon: Scale level {level:.5f} triggered but past exit time - skipping")
-                        remaining_levels.append(level)
-                        continue
-                # Determine lot size based on scale order
-                # Find the index of this level in the full original list
-                try:
-                    level_index = full_scale_levels.index(level)
-                except ValueError:
-                    level_index = 0  # Fallback
-                
-                if is_reversal_trade:
-                    # For reversal: only 1 scale (50%) with 4x lot size
-                    lot_size = LOT_SIZE * 8
+            # Execute scale-in entry
+            ticket = open_position(
+                direction=direction,
+                lot_size=lot_size,
+                tp_price=tp_price,
+                comment=f"{session}_SCALE_{level:.5f}"
+            )
+            
+            if ticket:
+                if session == 'MORNING':
+                    state.morning_positions.add(ticket)
                 else:
-                    # For initial breakout - lot sizing based on which level is hit first (closest to breakout)
-                    # The level closest to breakout gets smallest lot (2x), deepest gets largest (4x)
-                    # BUY levels: [12.5, 15, 17.5] - hit order: 17.5(2x), 15(3x), 12.5(4x)
-                    # SELL levels: [17.5, 15, 12.5] - hit order: 12.5(2x), 15(3x), 17.5(4x)
-                    # Both use same formula: deepest in list gets most lot size
-                    lot_size = LOT_SIZE * (4 - level_index)  # 0->4x, 1->3x, 2->2x
-                
-                # Execute scale-in entry
-                ticket = open_position(
-                    direction=direction,
-                    lot_size=lot_size,
-                    tp_price=tp_price,
-                    comment=f"{session}_SCALE_{level:.5f}"
-                )
+                    state.afternoon_positions.add(ticket)
                 
-                if ticket:
-                    if session == 'MORNING':
-                        state.morning_positions.append(ticket)
-                    else:
-                        state.afternoon_positions.append(ticket)
-                    
-                    logger.info(f"Scale-in executed at {level:.5f} with {lot_size/LOT_SIZE:.1f}x lot for {session} session")
-            else:
-                remaining_levels.append(level)
+                logger.info(f"Scale-in executed at {level:.5f} with {lot_size/LOT_SIZE:.1f}x lot for {session} session")
         
-        return remaining_levels
+        return levels[keep].tolist()
         
     except Exception as e:
         logger.error(f"Error in scaling logic: {e}")
@@ -680,51 +729,51 @@ def check_reversal(candles: np.ndarray, range_info: Dict,
     Returns:
         'BUY' or 'SELL' if reversal detected, None otherwise
     """
-    try:
-        # IMPORTANT: Exclude the last candle (currently forming)
-        # We only check the last COMPLETED candle for reversal
-        if len(candles) < 2:
-            return None
-        
-        # Get all completed candles (exclude the forming one)
-        completed_candles = candles[:-1]
-        
-        # Check the most recent COMPLETED candle
-        last_completed_candle = completed_candles[-1]
-        close_price = last_completed_candle['close']
-        current_direction = breakout_info['direction']
-        
-        range_high = range_info['high']
-        range_low = range_info['low']
-        
-        # Check for opposite breakout (candle must CLOSE beyond range)
-        if current_direction == 'BUY':
-            # Check if candle CLOSED below range low
-            if close_price < range_low:
-                logger.info(f"REVERSAL DETECTED: Candle closed below {range_low:.5f} (closed at {close_price:.5f})")
-                return 'SELL'
-        else:
-            # Check if candle CLOSED above range high
-            if close_price > range_high:
-                logger.info(f"REVERSAL DETECTED: Candle closed above {range_high:.5f} (closed at {close_price:.5f})")
-                return 'BUY'
-        
-        return None
-        
-    except Exception as e:
-        logger.error(f"Error checking reversal: {e}")
-        return None
+    # IMPORTANT: Exclude the last candle (currently forming)
+    # We only check COMPLETED candles for reversal
+    completed_candles = candles[:-1]
+    
+    # Check the most recent COMPLETED candle, plus any others that completed since the
+    # previous loop iteration if polling fell behind - never reaching back before the breakout
+    times = completed_candles['time']
+    start = len(completed_candles) - 1
+    if state.last_completed_candle_time is not None:
+        start = min(start, np.searchsorted(times, state.last_completed_candle_time, side='right'))
+    start = max(start, np.searchsorted(times, breakout_info['time']))
+    closes = completed_candles['close'][start:]
+    
+    range_high = range_info['high']
+    range_low = range_info['low']
+    
+    # Check for opposite breakout (candle must CLOSE beyond range) - first crossing wins
+    if breakout_info['direction'] == 'BUY':
+        # Check if candle CLOSED below range low
+        crossed = closes < range_low
+        if crossed.any():
+            close_price = closes[crossed.argmax()]
+            logger.info(f"REVERSAL DETECTED: Candle closed below {range_low:.5f} (closed at {close_price:.5f})")
+            return 'SELL'
+    else:
+        # Check if candle CLOSED above range high
+        crossed = closes > range_high
+        if crossed.any():
+            close_price = closes[crossed.argmax()]
+            logger.info(f"REVERSAL DETECTED: Candle closed above {range_high:.5f} (closed at {close_price:.5f})")
+            return 'BUY'
+    
+    return None
 
-def handle_reversal(new_direction: str, range_info: Dict, candles: np.ndarray,
-                    session: str) -> Optional[Dict]:
+def handle_reversal(new_direction: str, range_info: Dict, latest: Candle,
+                    session: str, now: Optional[datetime] = None) -> Optional[Dict]:
     """
     Handle reversal: close all positions and optionally open new ones
     
     Args:
         new_direction: New direction ('BUY' or 'SELL')
         range_info: Range information
-        candles: Numpy array of OHLC data
+        latest: Currently forming candle
         session: 'MORNING' or 'AFTERNOON'
+        now: VM time of this poll (default: datetime.now())
         
     Returns:
         New breakout info if opened, None otherwise
@@ -741,15 +790,15 @@ def handle_reversal(new_direction: str, range_info: Dict, candles: np.ndarray,
         
         # Clear position lists
         if session == 'MORNING':
-            state.morning_positions = []
+            state.morning_positions = set()
         else:
-            state.afternoon_positions = []
+            state.afternoon_positions = set()
         
         # Check if we're still within the entry window for this session
         if session == 'MORNING':
-            can_enter = can_enter_morning_trade()
+            can_enter = can_enter_morning_trade(now)
         else:
-            can_enter = can_enter_afternoon_trade()
+            can_enter = can_enter_afternoon_trade(now)
         
         if not can_enter:
             logger.info(f"{session}: Reversal detected but past entry cutoff - positions closed, STOP TRADING")
@@ -767,13 +816,12 @@ def handle_reversal(new_direction: str, range_info: Dict, candles: np.ndarray,
                 state.afternoon_reversal_count += 1
             
             # Open new position in opposite direction with double lot size
-            latest_candle = candles[-1]
             breakout_info = {
                 'direction': new_direction,
-                'price': float(latest_candle['close']),
-                'time': datetime.fromtimestamp(latest_candle['time']),
-                'candle_high': float(latest_candle['high']),
-                'candle_low': float(latest_candle['low'])
+                'price': latest.close,
+                'time': latest.time,
+                'candle_high': latest.high,
+                'candle_low': latest.low
             }
             
             tp_price = calculate_tp(breakout_info)
@@ -787,9 +835,9 @@ def handle_reversal(new_direction: str, range_info: Dict, candles: np.ndarray,
             
             if ticket:
                 if session == 'MORNING':
-                    state.morning_positions.append(ticket)
+                    state.morning_positions.add(ticket)
                 else:
-                    state.afternoon_positions.append(ticket)
+                    state.afternoon_positions.add(ticket)
                 
                 logger.info(f"Reversal position opened: {new_direction}")
                 return breakout_info
@@ -846,14 +894,18 @@ def calculate_tp(breakout_info: Dict) -> float:
 # TIME MANAGEMENT
 # =============================================================================
 
-def get_adjusted_time() -> time:
+def get_adjusted_time(now: Optional[datetime] = None) -> time:
     """
     Get current time adjusted for timezone offset.
     
     When VM system time is 8:00 and TIMEZONE_OFFSET_HOURS is 2,
     this returns 10:00 to match the market data timezone.
+    
+    The predicates below all take an optional VM-time `now` (default: datetime.now())
+    so one loop iteration can evaluate them against a single clock reading.
     """
-    now = datetime.now()
+    if now is None:
+        now = datetime.now()
     adjusted = now + timedelta(hours=TIMEZONE_OFFSET_HOURS)
     return adjusted.time()
 
@@ -873,89 +925,151 @@ def add_hours_to_time(t: time, hours: int) -> time:
     adjusted_dt = temp_dt + timedelta(hours=hours)
     return adjusted_dt.time()
 
-def get_current_time() -> time:
+# Session boundaries shifted to broker time - the offset is fixed, so once at import
+MORNING_RANGE_END_BROKER = add_hours_to_time(MORNING_RANGE_END, TIMEZONE_OFFSET_HOURS)
+AFTERNOON_RANGE_END_BROKER = add_hours_to_time(AFTERNOON_RANGE_END, TIMEZONE_OFFSET_HOURS)
+MORNING_ENTRY_START_BROKER = add_hours_to_time(MORNING_ENTRY_START, TIMEZONE_OFFSET_HOURS)
+MORNING_ENTRY_CUTOFF_BROKER = add_hours_to_time(MORNING_ENTRY_CUTOFF, TIMEZONE_OFFSET_HOURS)
+AFTERNOON_ENTRY_START_BROKER = add_hours_to_time(AFTERNOON_ENTRY_START, TIMEZONE_OFFSET_HOURS)
+AFTERNOON_EXIT_TIME_BROKER = add_hours_to_time(AFTERNOON_EXIT_TIME, TIMEZONE_OFFSET_HOURS)
+
+def get_current_time(now: Optional[datetime] = None) -> time:
     """Get current time (using system time)"""
-    return get_adjusted_time()
+    return get_adjusted_time(now)
 
-def get_current_date() -> datetime.date:
+def get_current_date(now: Optional[datetime] = None) -> datetime.date:
     """Get current date adjusted for timezone offset"""
-    now = datetime.now()
+    if now is None:
+        now = datetime.now()
     adjusted = now + timedelta(hours=TIMEZONE_OFFSET_HOURS)
     return adjusted.date()
 
-def is_trading_day() -> bool:
+def is_trading_day(now: Optional[datetime] = None) -> bool:
     """Check if today is a trading day (Monday-Friday)"""
-    now = datetime.now()
+    if now is None:
+        now = datetime.now()
     adjusted = now + timedelta(hours=TIMEZONE_OFFSET_HOURS)
     weekday = adjusted.weekday()
     return weekday < 5  # Monday=0, Friday=4
 
-def should_calculate_morning_range() -> bool:
+def should_calculate_morning_range(now: Optional[datetime] = None) -> bool:
     """Check if we should calculate morning range"""
-    current_time = get_current_time()
-    adjusted_range_end = add_hours_to_time(MORNING_RANGE_END, TIMEZONE_OFFSET_HOURS)
+    current_time = get_current_time(now)
+    adjusted_range_end = MORNING_RANGE_END_BROKER
     should_calc = (current_time >= adjusted_range_end and 
                    current_time < time(23, 59) and
                    state.morning_range is None)
     # logger.debug(f"should_calculate_morning_range: current_time={current_time}, RANGE_END={adjusted_range_end}, should_calc={should_calc}")
     return should_calc
 
-def should_calculate_afternoon_range() -> bool:
+def should_calculate_afternoon_range(now: Optional[datetime] = None) -> bool:
     """Check if we should calculate afternoon range"""
-    current_time = get_current_time()
-    adjusted_range_end = add_hours_to_time(AFTERNOON_RANGE_END, TIMEZONE_OFFSET_HOURS)
+    current_time = get_current_time(now)
+    adjusted_range_end = AFTERNOON_RANGE_END_BROKER
     should_calc = (current_time >= adjusted_range_end and 
                    current_time < time(23, 59) and
                    state.afternoon_range is None)
     # logger.debug(f"should_calculate_afternoon_range: current_time={current_time}, RANGE_END={adjusted_range_end}, should_calc={should_calc}")
     return should_calc
 
-def can_enter_morning_trade() -> bool:
+def can_enter_morning_trade(now: Optional[datetime] = None) -> bool:
     """Check if new morning trades can be entered"""
-    current_time = get_current_time()
-    adjusted_entry_start = add_hours_to_time(MORNING_ENTRY_START, TIMEZONE_OFFSET_HOURS)
-    adjusted_entry_cutoff = add_hours_to_time(MORNING_ENTRY_CUTOFF, TIMEZONE_OFFSET_HOURS)
+    current_time = get_current_time(now)
+    adjusted_entry_start = MORNING_ENTRY_START_BROKER
+    adjusted_entry_cutoff = MORNING_ENTRY_CUTOFF_BROKER
     can_enter = (current_time >= adjusted_entry_start and 
                  current_time <= adjusted_entry_cutoff and
                  state.morning_reversal_count < 2)
     logger.debug(f"can_enter_morning_trade: current_time={current_time}, ENTRY_START={adjusted_entry_start}, CUTOFF={adjusted_entry_cutoff}, can_enter={can_enter}")
     return can_enter
 
-def can_enter_afternoon_trade() -> bool:
+def can_enter_afternoon_trade(now: Optional[datetime] = None) -> bool:
     """Check if new afternoon trades can be entered"""
-    current_time = get_current_time()
-    adjusted_entry_start = add_hours_to_time(AFTERNOON_ENTRY_START, TIMEZONE_OFFSET_HOURS)
-    adjusted_exit_time = add_hours_to_time(AFTERNOON_EXIT_TIME, TIMEZONE_OFFSET_HOURS)
+    current_time = get_current_time(now)
+    adjusted_entry_start = AFTERNOON_ENTRY_START_BROKER
+    adjusted_exit_time = AFTERNOON_EXIT_TIME_BROKER
     can_enter = (current_time >= adjusted_entry_start and 
                  current_time < adjusted_exit_time and
                  state.afternoon_reversal_count < 2)
     logger.debug(f"can_enter_afternoon_trade: current_time={current_time}, ENTRY_START={adjusted_entry_start}, EXIT_TIME={adjusted_exit_time}, can_enter={can_enter}")
     return can_enter
 
-def should_force_close_afternoon() -> bool:
+def candles_to_fetch(now: Optional[datetime] = None) -> int:
+    """
+    Number of recent candles the pending session steps need.
+    
+    A range still to be calculated or a breakout still to be found scans back to
+    its window start today; after that the sessions only read the forming candle
+    and the last completed one.
+    """
+    pending_starts = []
+    if state.morning_range is None:
+        pending_starts.append(MORNING_RANGE_START)
+    elif not state.morning_initial_breakout_done:
+        pending_starts.append(MORNING_ENTRY_START)
+    if state.afternoon_range is None:
+        pending_starts.append(AFTERNOON_RANGE_START)
+    elif not state.afternoon_initial_breakout_done:
+        pending_starts.append(AFTERNOON_ENTRY_START)
+    
+    if not pending_starts:
+        return CANDLE_FETCH_MARGIN
+    
+    # Same broker-time window start as get_range / check_breakout use
+    if now is None:
+        now = datetime.now()
+    broker_now = now + timedelta(hours=TIMEZONE_OFFSET_HOURS)
+    window_start = session_candle_time(broker_now.date(), min(pending_starts))
+    elapsed_candles = (to_candle_time(broker_now) - window_start) // TIMEFRAME_SECONDS
+    return max(elapsed_candles, 0) + CANDLE_FETCH_MARGIN
+
+# Clock times (VM local) at which the session logic changes behaviour
+SESSION_BOUNDARIES = (
+    MORNING_RANGE_END, MORNING_ENTRY_START, MORNING_ENTRY_CUTOFF,
+    AFTERNOON_RANGE_END, AFTERNOON_ENTRY_START, AFTERNOON_EXIT_TIME
+)
+
+def poll_sleep_seconds() -> float:
+    """
+    How long main_loop should sleep before polling again.
+    
+    Normally POLL_INTERVAL, but cut short so the next poll lands on the next
+    candle close or session boundary instead of up to POLL_INTERVAL after it.
+    """
+    now = datetime.now() + timedelta(hours=TIMEZONE_OFFSET_HOURS)
+    now_ts = (now - CANDLE_EPOCH).total_seconds()
+    next_event_ts = now_ts + TIMEFRAME_SECONDS - now_ts % TIMEFRAME_SECONDS
+    for boundary in SESSION_BOUNDARIES:
+        boundary_ts = session_candle_time(now.date(), boundary)
+        if now_ts < boundary_ts < next_event_ts:
+            next_event_ts = boundary_ts
+    return min(POLL_INTERVAL, max(MIN_POLL_INTERVAL, next_event_ts - now_ts))
+
+def should_force_close_afternoon(now: Optional[datetime] = None) -> bool:
     """Check if we should force close afternoon positions"""
-    current_time = get_current_time()
-    adjusted_exit_time = add_hours_to_time(AFTERNOON_EXIT_TIME, TIMEZONE_OFFSET_HOURS)
+    current_time = get_current_time(now)
+    adjusted_exit_time = AFTERNOON_EXIT_TIME_BROKER
     return current_time >= adjusted_exit_time
 
 # =============================================================================
 # MAIN TRADING LOOP
 # =============================================================================
 
-def process_morning_session(candles: np.ndarray):
+def process_morning_session(candles: np.ndarray, latest: Candle,
+                          last_completed: Optional[Candle], now: Optional[datetime] = None):
     """Process morning trading session logic"""
     try:
-        current_date = get_current_date()
-        current_time = get_current_time()
+        current_date = get_current_date(now)
+        current_time = get_current_time(now)
         
         # Skip morning session if we're past the entry cutoff (already in afternoon or evening)
-        adjusted_cutoff = add_hours_to_time(MORNING_ENTRY_CUTOFF, TIMEZONE_OFFSET_HOURS)
+        adjusted_cutoff = MORNING_ENTRY_CUTOFF_BROKER
         if current_time > adjusted_cutoff and state.morning_range is None:
             logger.debug(f"Skipping morning session - past cutoff time (current: {current_time}, cutoff: {adjusted_cutoff})")
             return
         
         # Calculate range if needed
-        if state.morning_range is None and should_calculate_morning_range():
+        if state.morning_range is None and should_calculate_morning_range(now):
             state.morning_range = get_range(
                 candles, MORNING_RANGE_START, MORNING_RANGE_END, current_date
             )
@@ -966,7 +1080,7 @@ def process_morning_session(candles: np.ndarray):
         logger.debug(f"Morning breakout check: range={state.morning_range is not None}, initial_done={state.morning_initial_breakout_done}")
         if (state.morning_range is not None and 
             not state.morning_initial_breakout_done and 
-            can_enter_morning_trade()):
+            can_enter_morning_trade(now)):
             logger.info("Morning: Checking for breakout...")
             
             breakout = check_breakout(
@@ -978,11 +1092,9 @@ def process_morning_session(candles: np.ndarray):
                 state.morning_initial_breakout_done = True
                 
                 # Store the timestamp of the breakout candle (last completed candle)
-                df = pd.DataFrame(candles)
-                df = df.iloc[:-1]  # Exclude forming candle
-                if not df.empty:
-                    state.morning_breakout_candle_time = df.iloc[-1]['time']
-                    logger.info(f"Morning breakout candle time: {state.morning_breakout_candle_time}")
+                if last_completed is not None:
+                    state.morning_breakout_candle_time = last_completed.time
+                    logger.info(f"Morning breakout candle time: {_fmt_ts(state.morning_breakout_candle_time)}")
                 
                 # Calculate TP and open initial position
                 tp_price = calculate_tp(breakout)
@@ -995,7 +1107,7 @@ def process_morning_session(candles: np.ndarray):
                 
                 if ticket:
                     state.morning_breakout = breakout
-                    state.morning_positions.append(ticket)
+                    state.morning_positions.add(ticket)
                     
                     # Calculate scale levels
                     state.morning_scale_levels = calculate_scale_levels(
@@ -1016,15 +1128,15 @@ def process_morning_session(candles: np.ndarray):
                 if len(morning_open) == 0 and len(state.morning_positions) > 0:
                     # All positions were closed (by TP or manually)
                     logger.info("Morning positions closed (TP hit) - monitoring remaining scale levels")
-                    state.morning_positions = []
+                    state.morning_positions = set()
                     # DON'T recalculate scale levels - keep the existing ones (already executed levels are removed)
             
             # Check and execute scaling FIRST (before reversal check)
             # This ensures that if a candle sweeps through multiple levels and triggers reversal,
             # all scale positions are opened before being closed by the reversal
             state.morning_scale_levels = check_and_execute_scaling(
-                candles, state.morning_range, state.morning_breakout,
-                state.morning_scale_levels, 'MORNING'
+                latest, last_completed, state.morning_range, state.morning_breakout,
+                state.morning_scale_levels, 'MORNING', now
             )
             
             # Check for reversal AFTER scaling
@@ -1034,7 +1146,7 @@ def process_morning_session(candles: np.ndarray):
             
             if reversal_direction:
                 new_breakout = handle_reversal(
-                    reversal_direction, state.morning_range, candles, 'MORNING'
+                    reversal_direction, state.morning_range, latest, 'MORNING', now
                 )
                 if new_breakout:
                     state.morning_breakout = new_breakout
@@ -1044,21 +1156,22 @@ def process_morning_session(candles: np.ndarray):
                     )
         
     except Exception as e:
-        logger.error(f"Error in morning session processing: {e}")
+        logger.error(f"Error in morning session processing: {e}", exc_info=True)
 
-def process_afternoon_session(candles: np.ndarray):
+def process_afternoon_session(candles: np.ndarray, latest: Candle,
+                          last_completed: Optional[Candle], now: Optional[datetime] = None):
     """Process afternoon trading session logic"""
     try:
-        current_date = get_current_date()
-        current_time = get_current_time()
+        current_date = get_current_date(now)
+        current_time = get_current_time(now)
         
         # Force close if past exit time
-        adjusted_exit = add_hours_to_time(AFTERNOON_EXIT_TIME, TIMEZONE_OFFSET_HOURS)
-        if should_force_close_afternoon():
+        adjusted_exit = AFTERNOON_EXIT_TIME_BROKER
+        if should_force_close_afternoon(now):
             if state.afternoon_positions:
                 logger.info(f"Force closing all afternoon positions - past exit time ({current_time} >= {adjusted_exit})")
                 close_all_positions(session='AFTERNOON')
-                state.afternoon_positions = []
+                state.afternoon_positions = set()
             logger.debug(f"Skipping afternoon session - past exit time (current: {current_time}, exit: {adjusted_exit})")
             return
         
@@ -1068,7 +1181,7 @@ def process_afternoon_session(candles: np.ndarray):
             return
         
         # Calculate range if needed
-        if state.afternoon_range is None and should_calculate_afternoon_range():
+        if state.afternoon_range is None and should_calculate_afternoon_range(now):
             state.afternoon_range = get_range(
                 candles, AFTERNOON_RANGE_START, AFTERNOON_RANGE_END, current_date
             )
@@ -1079,7 +1192,7 @@ def process_afternoon_session(candles: np.ndarray):
         logger.debug(f"Afternoon breakout check: range={state.afternoon_range is not None}, initial_done={state.afternoon_initial_breakout_done}")
         if (state.afternoon_range is not None and 
             not state.afternoon_initial_breakout_done and 
-            can_enter_afternoon_trade()):
+            can_enter_afternoon_trade(now)):
             logger.info("Afternoon: Checking for breakout...")
             
             breakout = check_breakout(
@@ -1091,11 +1204,9 @@ def process_afternoon_session(candles: np.ndarray):
                 state.afternoon_initial_breakout_done = True
                 
                 # Store the timestamp of the breakout candle (last completed candle)
-                df = pd.DataFrame(candles)
-                df = df.iloc[:-1]  # Exclude forming candle
-                if not df.empty:
-                    state.afternoon_breakout_candle_time = df.iloc[-1]['time']
-                    logger.info(f"Afternoon breakout candle time: {state.afternoon_breakout_candle_time}")
+                if last_completed is not None:
+                    state.afternoon_breakout_candle_time = last_completed.time
+                    logger.info(f"Afternoon breakout candle time: {_fmt_ts(state.afternoon_breakout_candle_time)}")
                 
                 # Calculate TP and open initial position
                 tp_price = calculate_tp(breakout)
@@ -1108,7 +1219,7 @@ def process_afternoon_session(candles: np.ndarray):
                 
                 if ticket:
                     state.afternoon_breakout = breakout
-                    state.afternoon_positions.append(ticket)
+                    state.afternoon_positions.add(ticket)
                     
                     # Calculate scale levels
                     state.afternoon_scale_levels = calculate_scale_levels(
@@ -1129,15 +1240,15 @@ def process_afternoon_session(candles: np.ndarray):
                 if len(afternoon_open) == 0 and len(state.afternoon_positions) > 0:
                     # All positions were closed (by TP or manually)
                     logger.info("Afternoon positions closed (TP hit) - monitoring remaining scale levels")
-                    state.afternoon_positions = []
+                    state.afternoon_positions = set()
                     # DON'T recalculate scale levels - keep the existing ones (already executed levels are removed)
             
             # Check and execute scaling FIRST (before reversal check)
             # This ensures that if a candle sweeps through multiple levels and triggers reversal,
             # all scale positions are opened before being closed by the reversal
             state.afternoon_scale_levels = check_and_execute_scaling(
-                candles, state.afternoon_range, state.afternoon_breakout,
-                state.afternoon_scale_levels, 'AFTERNOON'
+                latest, last_completed, state.afternoon_range, state.afternoon_breakout,
+                state.afternoon_scale_levels, 'AFTERNOON', now
             )
             
             # Check for reversal AFTER scaling
@@ -1147,7 +1258,7 @@ def process_afternoon_session(candles: np.ndarray):
             
             if reversal_direction:
                 new_breakout = handle_reversal(
-                    reversal_direction, state.afternoon_range, candles, 'AFTERNOON'
+                    reversal_direction, state.afternoon_range, latest, 'AFTERNOON', now
                 )
                 if new_breakout:
                     state.afternoon_breakout = new_breakout
@@ -1157,14 +1268,14 @@ def process_afternoon_session(candles: np.ndarray):
                     )
         
     except Exception as e:
-        logger.error(f"Error in afternoon session processing: {e}")
+        logger.error(f"Error in afternoon session processing: {e}", exc_info=True)
 
-def check_new_day():
+def check_new_day(now: Optional[datetime] = None):
     """Check if it's a new trading day and reset state"""
-    current_date = get_current_date()
+    current_date = get_current_date(now)
     
     # Simple new day detection (can be enhanced with proper tracking)
-    current_time = get_current_time()
+    current_time = get_current_time(now)
     
     # Reset at midnight
     if current_time < time(0, 5):  # Early morning reset window
@@ -1182,42 +1293,68 @@ def main_loop():
     logger.info(f"TP Units: {TP_UNITS}")
     logger.info("=" * 80)
     
+    # Last tick and broker minute the sessions were processed for
+    last_tick_msc = None
+    last_minute = None
+    
     while True:
         try:
+            # One clock reading for every time check in this iteration
+            now = datetime.now()
+            
             # Check if it's a trading day
-            if not is_trading_day():
+            if not is_trading_day(now):
                 logger.info("Weekend - waiting for next trading day")
                 time_module.sleep(3600)  # Check every hour
                 continue
             
             # Check for new day
-            check_new_day()
+            check_new_day(now)
             
-            # Get latest candles (fetch enough to cover full trading day)
-            candles = get_candles(SYMBOL, TIMEFRAME, count=1500)
+            # The sessions only react to new prices and to the clock (range ends, entry
+            # cutoffs and exit time all fall on minute boundaries) - until a new tick
+            # arrives or the minute turns over, skip the candle fetch and processing.
+            # The poll sleep outlasts TICK_CACHE_TTL, so this is always a fresh tick,
+            # and any orders sent while processing it reuse the same snapshot
+            tick = get_tick()
+            tick_msc = tick.time_msc if tick is not None else None
+            minute = get_current_time(now).replace(second=0, microsecond=0)
+            if tick_msc is not None and tick_msc == last_tick_msc and minute == last_minute:
+                time_module.sleep(poll_sleep_seconds())
+                continue
+            
+            # Get latest candles (enough to reach back to the earliest pending session window)
+            candles = get_candles(SYMBOL, TIMEFRAME, count=candles_to_fetch(now))
             if candles is None:
                 logger.warning("Failed to retrieve candles, retrying...")
                 time_module.sleep(POLL_INTERVAL)
                 continue
             
+            # Read the forming and last completed candles once for both sessions
+            latest = latest_candle_tuple(candles)
+            last_completed = latest_candle_tuple(candles, -2)
+            
             # Log current adjusted time for debugging
-            current_time = get_current_time()
+            current_time = get_current_time(now)
             logger.debug(f"=== Bot loop iteration: VM time + {TIMEZONE_OFFSET_HOURS}h offset = {current_time} ===")
             
             # Process morning session
-            process_morning_session(candles)
+            process_morning_session(candles, latest, last_completed, now)
             
             # Process afternoon session
-            process_afternoon_session(candles)
+            process_afternoon_session(candles, latest, last_completed, now)
+            if last_completed is not None:
+                state.last_completed_candle_time = last_completed.time
+            last_tick_msc, last_minute = tick_msc, minute
             
-            # Wait before next iteration
-            time_module.sleep(POLL_INTERVAL)
+            # Wait before next iteration (waking on the next candle close / session boundary)
+            time_module.sleep(poll_sleep_seconds())
             
         except KeyboardInterrupt:
             logger.info("Bot stopped by user")
             break
         except Exception as e:
-            logger.error(f"Unexpected error in main loop: {e}")
+            logger.error(f"Unexpected error in main loop: {e}", exc_info=True)
             time_module.sleep(POLL_INTERVAL * 2)  # Wait longer on error
 
 # =============================================================================
@@ -4,11 +4,181 @@ Run this before starting the trading bot to verify your MT5 connection and confi
 """
 
 import MetaTrader5 as mt5
+import numpy as np
+import argparse
+import atexit
+import json
+import os
 import sys
+import time
 from datetime import datetime
+from functools import lru_cache
+from types import SimpleNamespace
+
+# --fast: reuse the last snapshot written within SNAPSHOT_CACHE_TTL seconds (kept
+# per user rather than in the working directory)
+SNAPSHOT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "trading_bot", "verify_snapshot.json")
+SNAPSHOT_CACHE_TTL = 60
+
+# Candles fetched by the historical data test - only the latest is displayed;
+# --deep pulls DEEP_CHECK_COUNT and checks their times are in order
+DISPLAY_COUNT = 1
+DEEP_CHECK_COUNT = 50
+
+# --skip-if-fresh N: exit straight away if HEALTH_FILE records a full pass
+# made less than N seconds ago
+HEALTH_FILE = ".verify_ok"
+
+# Read-only MT5 lookups shared by the verification steps - each one is a round-trip
+# to the terminal and the answers don't change while the checks run
+_cache = {}
+
+def _cached(key, fetch):
+    """Return the cached result for key, calling fetch() the first time"""
+    if key not in _cache:
+        _cache[key] = fetch()
+    return _cache[key]
+
+def _symbol_info(symbol):
+    return _cached(('symbol_info', symbol), lambda: mt5.symbol_info(symbol))
+
+def _symbol_info_tick(symbol):
+    return _cached(('symbol_info_tick', symbol), lambda: mt5.symbol_info_tick(symbol))
+
+def _account_info():
+    return _cached(('account_info',), mt5.account_info)
+
+def _terminal_info():
+    return _cached(('terminal_info',), mt5.terminal_info)
+
+def _copy_rates(symbol, count):
+    return _cached(('rates', symbol, count),
+                   lambda: mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, count))
+
+def _version():
+    return _cached(('version',), mt5.version)
+
+# What fetch_snapshot stores besides the symbol name and candle count
+SNAPSHOT_KEYS = ('account', 'terminal', 'version', 'symbol_info', 'tick', 'rates')
+
+def fetch_snapshot(symbol, count=DISPLAY_COUNT):
+    """
+    Fetch everything the symbol tests read from MT5 in one pass.
+    
+    The lookups run one after another - the MetaTrader5 package doesn't document
+    concurrent calls as safe. A lookup that raises is stored as its exception and
+    re-raised by the test reading it.
+    """
+    lookups = {
+        'account': _account_info,
+        'terminal': _terminal_info,
+        'version': _version,
+        'symbol_info': lambda: _symbol_info(symbol),
+        'tick': lambda: _symbol_info_tick(symbol),
+        'rates': lambda: _copy_rates(symbol, count),
+    }
+    snapshot = {'name': symbol, 'count': count}
+    for key, lookup in lookups.items():
+        try:
+            snapshot[key] = lookup()
+        except Exception as e:
+            snapshot[key] = e
+    return snapshot
+
+def _to_json(value):
+    """JSON-ready form of a snapshot value (MT5 records, rates array, version tuple)"""
+    if isinstance(value, np.ndarray):
+        return {'dtype': value.dtype.descr, 'columns': {name: value[name].tolist() for name in value.dtype.names}}
+    if hasattr(value, '_asdict'):
+        return {'fields': value._asdict()}
+    if hasattr(value, '__dict__'):
+        return {'fields': vars(value)}
+    return value
+
+def _from_json(key, value):
+    """Snapshot value for key rebuilt from _to_json's form"""
+    if value is None:
+        return None
+    if key == 'rates':
+        rates = np.zeros(len(next(iter(value['columns'].values()), [])),
+                         dtype=[tuple(field) for field in value['dtype']])
+        for name, column in value['columns'].items():
+            rates[name] = column
+        return rates
+    if key == 'version':
+        return tuple(value)
+    return SimpleNamespace(**value['fields'])
+
+def load_cached_snapshot(symbol, count=DISPLAY_COUNT):
+    """Snapshot saved by a recent --fast run for this symbol, candle count and terminal version, or None"""
+    try:
+        with open(SNAPSHOT_CACHE_FILE) as f:
+            cached = json.load(f)
+        if (time.time() - cached['ts'] >= SNAPSHOT_CACHE_TTL or
+                tuple(cached['version']) != tuple(_version()) or
+                cached['name'] != symbol or
+                cached['count'] != count):
+            return None
+        snapshot = {'name': symbol, 'count': count}
+        for key in SNAPSHOT_KEYS:
+            snapshot[key] = _from_json(key, cached['values'][key])
+        return snapshot
+    except Exception:
+        return None
+
+def save_snapshot(snapshot):
+    """Write snapshot for the next --fast run (best effort, skipped if a lookup failed)"""
+    if any(isinstance(snapshot[key], Exception) for key in SNAPSHOT_KEYS):
+        return
+    try:
+        os.makedirs(os.path.dirname(SNAPSHOT_CACHE_FILE), exist_ok=True)
+        with open(SNAPSHOT_CACHE_FILE, 'w') as f:
+            json.dump({'ts': time.time(), 'version': list(_version()),
+                       'name': snapshot['name'], 'count': snapshot['count'],
+                       'values': {key: _to_json(snapshot[key]) for key in SNAPSHOT_KEYS}}, f)
+    except Exception as e:
+        print(f"⚠️  WARNING: Could not save verification cache: {e}")
+
+def recent_pass(max_age, deep=False):
+    """True if HEALTH_FILE records a pass within max_age seconds by this MetaTrader5 package"""
+    # The terminal version needs a connection, so only the package is compared here
+    try:
+        with open(HEALTH_FILE) as f:
+            health = json.load(f)
+        return (0 <= time.time() - health['ts'] < max_age and
+                health.get('package') == getattr(mt5, '__version__', None) and
+                bool(health.get('deep') or not deep))
+    except Exception:
+        return False
+
+def record_result(passed, deep=False):
+    """Write HEALTH_FILE after a full pass, remove it otherwise (best effort)"""
+    try:
+        if passed:
+            with open(HEALTH_FILE, 'w') as f:
+                json.dump({'ts': time.time(), 'version': list(_version() or ()),
+                           'package': getattr(mt5, '__version__', None), 'deep': deep}, f)
+        elif os.path.exists(HEALTH_FILE):
+            os.remove(HEALTH_FILE)
+    except Exception as e:
+        print(f"⚠️  WARNING: Could not update {HEALTH_FILE}: {e}")
+
+def _field(snapshot, key):
+    """Value fetched for key, re-raising the error if its lookup failed"""
+    value = snapshot[key]
+    if isinstance(value, Exception):
+        raise value
+    return value
+
+@lru_cache(maxsize=1024)
+def _ts(t):
+    """datetime for an MT5 epoch-seconds timestamp (memoized - fromtimestamp does a tz lookup)"""
+    return datetime.fromtimestamp(t)
 
 def print_section(title):
     """Print a section header"""
+    # Emit the previous section in one write (see main() - stdout isn't line-buffered)
+    sys.stdout.flush()
     print("\n" + "=" * 60)
     print(f"  {title}")
     print("=" * 60)
@@ -29,24 +199,26 @@ def verify_mt5_connection():
     print("✅ SUCCESS: Connected to MetaTrader5")
     
     # Get account info
-    account_info = mt5.account_info()
+    account_info = _account_info()
     if account_info:
-        print(f"\n   Account Number: {account_info.login}")
-        print(f"   Account Type: {'Demo' if account_info.trade_mode == mt5.ACCOUNT_TRADE_MODE_DEMO else 'Real'}")
-        print(f"   Balance: {account_info.balance:.2f} {account_info.currency}")
-        print(f"   Leverage: 1:{account_info.leverage}")
+        account_type = 'Demo' if account_info.trade_mode == mt5.ACCOUNT_TRADE_MODE_DEMO else 'Real'
+        print(f"\n   Account Number: {account_info.login}\n"
+              f"   Account Type: {account_type}\n"
+              f"   Balance: {account_info.balance:.2f} {account_info.currency}\n"
+              f"   Leverage: 1:{account_info.leverage}")
     
     # Get terminal info
-    print(f"\n   MT5 Version: {mt5.version()}")
-    print(f"   Terminal Info: {mt5.terminal_info()}")
+    print(f"\n   MT5 Version: {_version()}")
+    print(f"   Terminal Info: {_terminal_info()}")
     
     return True
 
-def verify_symbol(symbol="EURUSD"):
+def verify_symbol(snapshot):
     """Verify symbol availability"""
+    symbol = snapshot['name']
     print_section(f"Symbol Test: {symbol}")
     
-    symbol_info = mt5.symbol_info(symbol)
+    symbol_info = _field(snapshot, 'symbol_info')
     if symbol_info is None:
         print(f"❌ FAILED: Symbol {symbol} not found")
         print("\n   Troubleshooting:")
@@ -58,6 +230,9 @@ def verify_symbol(symbol="EURUSD"):
         print(f"⚠️  WARNING: Symbol {symbol} exists but not visible in Market Watch")
         print(f"   Attempting to enable...")
         if mt5.symbol_select(symbol, True):
+            # Selecting the symbol changes its properties (visible) - refetch for the later tests
+            _cache.pop(('symbol_info', symbol), None)
+            snapshot['symbol_info'] = _symbol_info(symbol)
             print(f"✅ SUCCESS: Symbol {symbol} enabled")
         else:
             print(f"❌ FAILED: Cannot enable {symbol}")
@@ -75,44 +250,56 @@ def verify_symbol(symbol="EURUSD"):
     print(f"   Volume Step: {symbol_info.volume_step}")
     
     # Get current price
-    tick = mt5.symbol_info_tick(symbol)
+    tick = _field(snapshot, 'tick')
     if tick:
         print(f"\n   Current Bid: {tick.bid:.5f}")
         print(f"   Current Ask: {tick.ask:.5f}")
-        print(f"   Last Update: {datetime.fromtimestamp(tick.time)}")
+        print(f"   Last Update: {_ts(int(tick.time))}")
     
     return True
 
-def verify_data_access(symbol="EURUSD", count=50):
+def verify_data_access(snapshot):
     """Verify historical data access"""
     print_section("Historical Data Test")
     
-    rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, count)
+    rates = _field(snapshot, 'rates')
     
     if rates is None or len(rates) == 0:
         print(f"❌ FAILED: Cannot retrieve historical data")
         print(f"   Error: {mt5.last_error()}")
         return False
     
-    print(f"✅ SUCCESS: Retrieved {len(rates)} candles")
+    print(f"✅ SUCCESS: Retrieved {len(rates)} candle{'s' if len(rates) != 1 else ''}")
+    
+    # Deep check: the history should come back in strictly increasing time order
+    if len(rates) > 1:
+        times = rates['time']
+        if not (times[1:] > times[:-1]).all():
+            print(f"❌ FAILED: Candle times are not in increasing order")
+            return False
+        print(f"✅ SUCCESS: Candle times are in order")
     
-    # Display sample data
+    # Display sample data - read the latest candle's fields out once
     latest = rates[-1]
+    candle_time, open_price, high, low, close, volume = (
+        latest[field] for field in ('time', 'open', 'high', 'low', 'close', 'tick_volume')
+    )
     print(f"\n   Latest Candle (5M):")
-    print(f"   Time: {datetime.fromtimestamp(latest['time'])}")
-    print(f"   Open: {latest['open']:.5f}")
-    print(f"   High: {latest['high']:.5f}")
-    print(f"   Low: {latest['low']:.5f}")
-    print(f"   Close: {latest['close']:.5f}")
-    print(f"   Volume: {latest['tick_volume']}")
+    print(f"   Time: {_ts(int(candle_time))}")
+    print(f"   Open: {open_price:.5f}")
+    print(f"   High: {high:.5f}")
+    print(f"   Low: {low:.5f}")
+    print(f"   Close: {close:.5f}")
+    print(f"   Volume: {volume}")
     
     return True
 
-def verify_trading_permissions(symbol="EURUSD"):
+def verify_trading_permissions(snapshot):
     """Verify trading permissions"""
+    symbol = snapshot['name']
     print_section("Trading Permissions Test")
     
-    symbol_info = mt5.symbol_info(symbol)
+    symbol_info = _field(snapshot, 'symbol_info')
     if symbol_info is None:
         print(f"❌ FAILED: Cannot get symbol info")
         return False
@@ -128,18 +315,18 @@ def verify_trading_permissions(symbol="EURUSD"):
     print(f"✅ SUCCESS: Trading is allowed for {symbol}")
     
     # Check if market is open
-    terminal_info = mt5.terminal_info()
+    terminal_info = _field(snapshot, 'terminal')
     if terminal_info:
         print(f"\n   Trade Allowed: {terminal_info.trade_allowed}")
         print(f"   Expert Advisors Allowed: {terminal_info.mqid}")
     
     return True
 
-def verify_lot_size(symbol="EURUSD", lot_size=0.1):
+def verify_lot_size(snapshot, lot_size=0.1):
     """Verify lot size is valid"""
     print_section(f"Lot Size Test: {lot_size}")
     
-    symbol_info = mt5.symbol_info(symbol)
+    symbol_info = _field(snapshot, 'symbol_info')
     if symbol_info is None:
         print(f"❌ FAILED: Cannot verify lot size")
         return False
@@ -156,8 +343,10 @@ def verify_lot_size(symbol="EURUSD", lot_size=0.1):
         print(f"❌ FAILED: Lot size {lot_size} exceeds maximum {max_lot}")
         return False
     
-    # Check if lot size is a valid multiple of step
-    if (lot_size - min_lot) % step != 0:
+    # Check if lot size is a valid multiple of step - count whole steps above the minimum
+    # instead of a float modulo, which flags exact multiples (0.1 - 0.01) % 0.01 != 0
+    steps = round((lot_size - min_lot) / step)
+    if abs(min_lot + steps * step - lot_size) > step * 1e-6:
         print(f"⚠️  WARNING: Lot size {lot_size} is not a valid multiple of step {step}")
         print(f"   Suggested values: {min_lot}, {min_lot + step}, {min_lot + 2*step}, ...")
     
@@ -167,10 +356,10 @@ def verify_lot_size(symbol="EURUSD", lot_size=0.1):
     print(f"   Lot Step: {step}")
     
     # Calculate margin requirement
-    account_info = mt5.account_info()
+    account_info = _field(snapshot, 'account')
     if account_info:
         # Simplified margin calculation
-        tick = mt5.symbol_info_tick(symbol)
+        tick = _field(snapshot, 'tick')
         if tick:
             contract_size = symbol_info.trade_contract_size
             leverage = account_info.leverage
@@ -183,8 +372,37 @@ def verify_lot_size(symbol="EURUSD", lot_size=0.1):
     
     return True
 
-def main():
+def run_test(name, test, *args):
+    """Run one verification test, reporting an exception as a failure"""
+    try:
+        return name, test(*args)
+    except Exception as e:
+        print(f"❌ EXCEPTION: {e}")
+        return name, False
+
+def main(argv=None):
     """Run all verification tests"""
+    parser = argparse.ArgumentParser(description='Verify the MT5 setup for the trading bot')
+    parser.add_argument('--fast', action='store_true',
+                        help=f'Reuse the MT5 snapshot from a --fast run in the last {SNAPSHOT_CACHE_TTL}s')
+    parser.add_argument('--deep', action='store_true',
+                        help=f'Fetch {DEEP_CHECK_COUNT} candles and check their time order')
+    parser.add_argument('--skip-if-fresh', type=float, metavar='N',
+                        help='Exit without connecting if every test passed in the last N seconds')
+    args = parser.parse_args(argv)
+    
+    if args.skip_if_fresh and recent_pass(args.skip_if_fresh, args.deep):
+        print(f"✅ Setup verified less than {args.skip_if_fresh:g}s ago - skipping checks")
+        sys.exit(0)
+    
+    # Shut MT5 down however main() exits, including the early sys.exit(1)
+    atexit.register(mt5.shutdown)
+    
+    # Buffer stdout instead of writing every line on a terminal - print_section
+    # flushes once per section, so progress still shows as each test finishes
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False)
+    
     print("\n")
     print("╔" + "═" * 58 + "╗")
     print("║" + " " * 15 + "MT5 TRADING BOT SETUP VERIFICATION" + " " * 9 + "║")
@@ -193,52 +411,38 @@ def main():
     results = []
     
     # Test 1: MT5 Connection
-    try:
-        results.append(("MT5 Connection", verify_mt5_connection()))
-    except Exception as e:
-        print(f"❌ EXCEPTION: {e}")
-        results.append(("MT5 Connection", False))
+    results.append(run_test("MT5 Connection", verify_mt5_connection))
     
     if not results[0][1]:
         print("\n❌ Cannot proceed without MT5 connection. Please fix the issue and try again.")
         sys.exit(1)
     
-    # Test 2: Symbol Availability
-    try:
-        results.append(("Symbol Availability", verify_symbol("EURUSD")))
-    except Exception as e:
-        print(f"❌ EXCEPTION: {e}")
-        results.append(("Symbol Availability", False))
-    
-    # Test 3: Historical Data
-    try:
-        results.append(("Historical Data", verify_data_access("EURUSD")))
-    except Exception as e:
-        print(f"❌ EXCEPTION: {e}")
-        results.append(("Historical Data", False))
-    
-    # Test 4: Trading Permissions
-    try:
-        results.append(("Trading Permissions", verify_trading_permissions("EURUSD")))
-    except Exception as e:
-        print(f"❌ EXCEPTION: {e}")
-        results.append(("Trading Permissions", False))
-    
-    # Test 5: Lot Size
-    try:
-        results.append(("Lot Size", verify_lot_size("EURUSD", 0.1)))
-    except Exception as e:
-        print(f"❌ EXCEPTION: {e}")
-        results.append(("Lot Size", False))
+    # Tests 2-5 only read MT5 state - fetch it all at once up front
+    count = DEEP_CHECK_COUNT if args.deep else DISPLAY_COUNT
+    snapshot = load_cached_snapshot("EURUSD", count) if args.fast else None
+    if snapshot is None:
+        snapshot = fetch_snapshot("EURUSD", count)
+        if args.fast:
+            save_snapshot(snapshot)
+    
+    # Tests 2-5
+    tests = [
+        ("Symbol Availability", verify_symbol, (snapshot,)),
+        ("Historical Data", verify_data_access, (snapshot,)),
+        ("Trading Permissions", verify_trading_permissions, (snapshot,)),
+        ("Lot Size", verify_lot_size, (snapshot, 0.1)),
+    ]
+    for name, test, test_args in tests:
+        results.append(run_test(name, test, *test_args))
     
     # Summary
     print_section("SUMMARY")
     
+    all_passed = True
     for test_name, passed in results:
         status = "✅ PASSED" if passed else "❌ FAILED"
         print(f"   {status}: {test_name}")
-    
-    all_passed = all(result[1] for result in results)
+        all_passed = all_passed and passed
     
     print("\n" + "=" * 60)
     if all_passed:
@@ -254,8 +458,8 @@ def main():
         print("   4. Enable algo trading in MT5 settings")
     print("=" * 60 + "\n")
     
-    # Cleanup
-    mt5.shutdown()
+    if args.skip_if_fresh is not None:
+        record_result(all_passed, args.deep)
     
     sys.exit(0 if all_passed else 1)
 